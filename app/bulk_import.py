@@ -0,0 +1,284 @@
+from collections.abc import AsyncIterable, AsyncIterator
+from typing import Annotated, Union
+from pydantic import Field, TypeAdapter, ValidationError
+from sqlalchemy import select, insert, or_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import async_session_maker
+from app.models import User, Skill, Project, user_skill_association, project_skill_association
+from app.schemas import SkillImport, UserImport, ProjectImport
+from app.skill_catalog import skill_catalog
+from app.response_cache import feed_cache, owner_stats_cache
+from app.skill_index import project_index, user_index
+
+ImportRecord = Annotated[
+    Union[SkillImport, UserImport, ProjectImport],
+    Field(discriminator="type"),
+]
+_record_adapter = TypeAdapter(ImportRecord)
+
+DEFAULT_BATCH_SIZE = 500
+
+
+# ============ NDJSON ИМПОРТ ============
+# Каждая строка — одна запись с полем "type":
+#   {"type": "skill", "name": "Python", "category": "backend"}
+#   {"type": "user", "username": "john_dev", "email": "...", "full_name": "...", "skill_ids": [1, 2]}
+#   {"type": "project", "owner_username": "john_dev", "title": "...", "description": "...", "skill_ids": [1]}
+# Записи копятся в пачку по batch_size штук; пачка пишется одной транзакцией.
+# Ошибки отдаются построчно и не прерывают импорт; в памяти — не больше одной пачки.
+
+async def import_ndjson(
+    lines: AsyncIterable[bytes | str],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> AsyncIterator[dict]:
+    """
+    Импортирует NDJSON-записи и по ходу отдаёт отчёт:
+    ошибки по строкам, итог каждой пачки и общий итог в конце.
+    """
+    stats = {"lines": 0, "imported": 0, "errors": 0, "batches": 0}
+    batch: list[tuple[int, ImportRecord]] = []
+
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+        stats["lines"] += 1
+
+        try:
+            record = _record_adapter.validate_json(line)
+        except ValidationError as e:
+            stats["errors"] += 1
+            yield _error(line_no, _describe(e))
+            continue
+
+        batch.append((line_no, record))
+        if len(batch) >= batch_size:
+            async for report in _flush(batch, stats):
+                yield report
+            batch = []
+
+    if batch:
+        async for report in _flush(batch, stats):
+            yield report
+
+    yield {"status": "done", **stats}
+
+
+async def _flush(batch: list[tuple[int, ImportRecord]], stats: dict) -> AsyncIterator[dict]:
+    """Пишет одну пачку: всё в одной транзакции, один commit"""
+    stats["batches"] += 1
+    errors: list[dict] = []
+
+    async with async_session_maker() as session:
+        try:
+            skills = await _import_skills(session, _of_type(batch, SkillImport), errors)
+            # Навыки этой пачки ещё не в каталоге, но ссылаться на них уже можно
+            new_skill_ids = {skill.id for skill in skills}
+            users = await _import_users(session, _of_type(batch, UserImport), new_skill_ids, errors)
+            projects = await _import_projects(session, _of_type(batch, ProjectImport), new_skill_ids, errors)
+            await session.commit()
+        except SQLAlchemyError as e:
+            await session.rollback()
+            stats["errors"] += len(batch)
+            for line_no, _ in batch:
+                yield _error(line_no, f"Batch rolled back: {e.__class__.__name__}")
+            yield {"batch": stats["batches"], "status": "failed", "imported": 0}
+            return
+
+    # Индексы и кэши обновляем только после успешного коммита
+    if skills:
+        skill_catalog.invalidate()
+    for user_id, skill_ids in users:
+        user_index.set_skills(user_id, skill_ids)
+    for project_id, owner_id, skill_ids in projects:
+        project_index.upsert(project_id, owner_id, skill_ids)
+    if projects:
+        feed_cache.invalidate()
+        owner_stats_cache.invalidate(*{owner_id for _, owner_id, _ in projects})
+
+    imported = len(batch) - len(errors)
+    stats["imported"] += imported
+    stats["errors"] += len(errors)
+    for error in errors:
+        yield error
+    yield {"batch": stats["batches"], "status": "committed", "imported": imported}
+
+
+async def _import_skills(
+    session: AsyncSession,
+    records: list[tuple[int, SkillImport]],
+    errors: list[dict],
+) -> list[Skill]:
+    if not records:
+        return []
+
+    names = [record.name for _, record in records]
+    taken = set((await session.execute(select(Skill.name).where(Skill.name.in_(names)))).scalars())
+
+    skills = []
+    for line_no, record in records:
+        if record.name in taken:
+            errors.append(_error(line_no, f"Skill '{record.name}' already exists"))
+            continue
+        taken.add(record.name)
+        skills.append(Skill(name=record.name, category=record.category))
+
+    session.add_all(skills)
+    await session.flush()
+    return skills
+
+
+async def _import_users(
+    session: AsyncSession,
+    records: list[tuple[int, UserImport]],
+    new_skill_ids: set[int],
+    errors: list[dict],
+) -> list[tuple[int, list[int]]]:
+    if not records:
+        return []
+
+    usernames = [record.username for _, record in records]
+    emails = [record.email for _, record in records]
+    stmt = select(User.username, User.email).where(
+        or_(User.username.in_(usernames), User.email.in_(emails))
+    )
+    taken_usernames, taken_emails = set(), set()
+    for username, email in await session.execute(stmt):
+        taken_usernames.add(username)
+        taken_emails.add(email)
+
+    known_skill_ids = await _known_skill_ids(records, new_skill_ids)
+    created: list[tuple[UserImport, list[int]]] = []
+    for line_no, record in records:
+        if record.username in taken_usernames:
+            errors.append(_error(line_no, "Username already registered"))
+            continue
+        if record.email in taken_emails:
+            errors.append(_error(line_no, "Email already registered"))
+            continue
+        taken_usernames.add(record.username)
+        taken_emails.add(record.email)
+        created.append((record, _filter_skill_ids(record.skill_ids, known_skill_ids)))
+    if not created:
+        return []
+
+    # Многострочный INSERT ... RETURNING на всю пачку вместо INSERT на каждого юзера.
+    # Порядок строк RETURNING в SQLite не гарантирован — сопоставляем по username
+    stmt = insert(User).returning(User.username, User.id)
+    id_by_username = dict((await session.execute(stmt, [
+        {
+            "username": record.username,
+            "email": record.email,
+            "full_name": record.full_name,
+            "timezone": record.timezone,
+            "skill_count": len(skill_ids),
+        }
+        for record, skill_ids in created
+    ])).all())
+    user_ids = [id_by_username[record.username] for record, _ in created]
+
+    rows = [
+        {
+            "user_id": user_id,
+            "skill_id": skill_id,
+            "is_favorite": skill_id in record.favorite_skill_ids,
+        }
+        for user_id, (record, skill_ids) in zip(user_ids, created)
+        for skill_id in skill_ids
+    ]
+    if rows:
+        await session.execute(insert(user_skill_association), rows)
+    return [(user_id, skill_ids) for user_id, (_, skill_ids) in zip(user_ids, created)]
+
+
+async def _import_projects(
+    session: AsyncSession,
+    records: list[tuple[int, ProjectImport]],
+    new_skill_ids: set[int],
+    errors: list[dict],
+) -> list[tuple[int, int, list[int]]]:
+    if not records:
+        return []
+
+    owner_ids = [record.owner_id for _, record in records if record.owner_id is not None]
+    owner_usernames = [record.owner_username for _, record in records if record.owner_username is not None]
+    stmt = select(User.id, User.username).where(
+        or_(User.id.in_(owner_ids), User.username.in_(owner_usernames))
+    )
+    known_ids, id_by_username = set(), {}
+    for user_id, username in await session.execute(stmt):
+        known_ids.add(user_id)
+        id_by_username[username] = user_id
+
+    known_skill_ids = await _known_skill_ids(records, new_skill_ids)
+    created: list[tuple[ProjectImport, int, list[int]]] = []
+    for line_no, record in records:
+        if record.owner_id is not None:
+            owner_id = record.owner_id if record.owner_id in known_ids else None
+        else:
+            owner_id = id_by_username.get(record.owner_username)
+        if owner_id is None:
+            errors.append(_error(line_no, "Owner not found"))
+            continue
+        created.append((record, owner_id, _filter_skill_ids(record.skill_ids, known_skill_ids)))
+    if not created:
+        return []
+
+    # Порядок строк RETURNING в SQLite не гарантирован, но rowid внутри одной
+    # вставки растут в порядке строк — отсортированные ID идут как записи
+    stmt = insert(Project).returning(Project.id)
+    project_ids = sorted((await session.execute(stmt, [
+        {
+            "title": record.title,
+            "description": record.description,
+            "owner_id": owner_id,
+            "skill_count": len(skill_ids),
+        }
+        for record, owner_id, skill_ids in created
+    ])).scalars())
+
+    rows = [
+        {"project_id": project_id, "skill_id": skill_id}
+        for project_id, (_, _, skill_ids) in zip(project_ids, created)
+        for skill_id in skill_ids
+    ]
+    if rows:
+        await session.execute(insert(project_skill_association), rows)
+    return [(project_id, owner_id, skill_ids) for project_id, (_, owner_id, skill_ids) in zip(project_ids, created)]
+
+
+async def _known_skill_ids(records: list[tuple[int, UserImport | ProjectImport]], new_skill_ids: set[int]) -> set[int]:
+    """
+    Какие из упомянутых в записях ID навыков существуют: из каталога — одним
+    resolve_ids на всю пачку, плюс созданные в этой же пачке. Новые навыки
+    в каталог не отправляем: там их ещё нет, и каждый такой промах стоил бы
+    запроса в БД и сброса снапшота.
+    """
+    mentioned = {skill_id for _, record in records for skill_id in record.skill_ids}
+    known = mentioned & new_skill_ids
+    if mentioned - known:
+        known.update(await skill_catalog.resolve_ids(mentioned - known))
+    return known
+
+
+def _filter_skill_ids(skill_ids: list[int], known_skill_ids: set[int]) -> list[int]:
+    """Существующие ID навыков записи, уникальные, в исходном порядке"""
+    return [skill_id for skill_id in dict.fromkeys(skill_ids) if skill_id in known_skill_ids]
+
+
+def _of_type(batch: list[tuple[int, ImportRecord]], record_type: type) -> list:
+    return [(line_no, record) for line_no, record in batch if isinstance(record, record_type)]
+
+
+def _error(line_no: int, message: str) -> dict:
+    return {"line": line_no, "status": "error", "error": message}
+
+
+def _describe(error: ValidationError) -> str:
+    """Короткое описание ошибок валидации: 'поле: сообщение; ...'"""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'record'}: {item['msg']}"
+        for item in error.errors(include_url=False)
+    )
@@ -0,0 +1,54 @@
+import argparse
+import asyncio
+import contextlib
+import json
+import sys
+from app.database import init_db
+from app.bulk_import import import_ndjson, DEFAULT_BATCH_SIZE
+
+
+# ============ КОНСОЛЬНЫЕ КОМАНДЫ ============
+# python -m app.cli import data.ndjson --batch-size 1000
+# cat data.ndjson | python -m app.cli import -
+
+async def _file_lines(path: str):
+    """Построчно читает файл (или stdin для '-'), не загружая его целиком"""
+    if path == "-":
+        for line in sys.stdin.buffer:
+            yield line
+        return
+    with open(path, "rb") as f:
+        for line in f:
+            yield line
+
+
+async def run_import(path: str, batch_size: int) -> int:
+    """Импортирует NDJSON-файл, печатает отчёт в stdout. Возвращает код выхода"""
+    # Сообщения init_db не должны смешиваться с NDJSON-отчётом
+    with contextlib.redirect_stdout(sys.stderr):
+        await init_db()
+
+    errors = 0
+    async for report in import_ndjson(_file_lines(path), batch_size):
+        print(json.dumps(report, ensure_ascii=False), flush=True)
+        if report.get("status") == "done":
+            errors = report["errors"]
+    return 1 if errors else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="Импорт из NDJSON-файла")
+    import_parser.add_argument("path", help="Путь к файлу или '-' для stdin")
+    import_parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+
+    args = parser.parse_args(argv)
+    if args.command == "import":
+        return asyncio.run(run_import(args.path, args.batch_size))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+# ============ НАСТРОЙКИ ПРИЛОЖЕНИЯ ============
+# Читаются из переменных окружения (без учёта регистра) и файла .env:
+# DATABASE_URL=sqlite+aiosqlite:///./prod.db, SQLITE_BUSY_TIMEOUT_MS=10000 и т.д.
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+    # --- БД ---
+    database_url: str = "sqlite+aiosqlite:///./project_matching.db"
+    database_echo: bool = False  # True — печатать все SQL-запросы в консоль
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_timeout: float = 30.0  # сек. ожидания свободного соединения из пула
+    # Отдельный read-only движок для GET-роутов (в WAL читатели не ждут писателей)
+    database_read_engine: bool = True
+    database_read_pool_size: int = 10
+
+    # --- SQLite PRAGMA, выставляются на каждом новом соединении ---
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000  # сколько ждать снятия блокировки вместо "database is locked"
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size_kib: int = 64 * 1024
+
+    # --- Мэтчинг ---
+    approximate_matching: bool = False
+    lsh_bands: int = 16
+    lsh_rows: int = 2
+
+    # --- Кэш ленты GET /projects/ ---
+    feed_cache_size: int = 256  # 0 — кэш выключен
+    feed_cache_ttl: float = 30.0
+
+    # --- Кэш статистики владельцев GET /projects/owner/{id}/stats ---
+    owner_stats_cache_size: int = 1024  # 0 — кэш выключен
+    owner_stats_cache_ttl: float = 60.0
+
+    # --- Батчинг загрузок (app/loaders.py) ---
+    loader_window_ms: float = 2.0  # сколько копить ID от параллельных запросов
+    loader_max_batch: int = 500
+
+    # --- Group commit заявок (app/write_batching.py) ---
+    application_batching: bool = False  # копить заявки и вставлять пачкой одним коммитом
+    application_batch_window_ms: float = 5.0
+    application_batch_max: int = 200
+
+    # --- Диагностика ---
+    slow_query_ms: float = 100.0
+    profiling_enabled: bool = False
+    profile_dir: str = "./profiles"
+
+
+settings = Settings()
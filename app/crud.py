@@ -1,9 +1,79 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
-from sqlalchemy import select
+from sqlalchemy.orm import joinedload, selectinload
+from sqlalchemy import select, update, delete, func, literal, literal_column, union_all, text, case, cast, Integer
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from datetime import datetime
-from app.models import User, Skill, Project, Application
+import re
+from typing import Literal
+from app.models import (
+    utcnow,
+    User,
+    Skill,
+    Project,
+    Application,
+    projects_fts,
+    user_skill_association,
+    project_skill_association,
+)
 from app.schemas import UserCreate, ProjectCreate
+from app.skill_index import project_index, user_index
+from app.rescoring import rescore_queue
+from app.skill_catalog import skill_catalog
+from app.response_cache import feed_cache, owner_stats_cache
+from app.pagination import decode_cursor, after_cursor
+
+
+# ============ LOADER PROFILES ============
+# Каждый сценарий грузит ровно тот граф связей, который ему нужен:
+# - "detail"       — всё, что сериализует схема детального просмотра;
+# - "list"         — то, что сериализует схема элемента списка;
+# - "for_matching" — только навыки, для расчёта совместимости.
+# Роут выбирает профиль, crud строит по нему опции загрузки.
+LoaderProfile = Literal["detail", "list", "for_matching"]
+
+LOADER_PROFILES = {
+    User: {
+        "detail": (selectinload(User.skills),),
+        "list": (selectinload(User.skills),),
+        "for_matching": (selectinload(User.skills),),
+    },
+    Project: {
+        # ProjectRead / ProjectListRead: owner (UserRead с навыками) + skills.
+        # Владелец у проекта один — в детальном просмотре берём его JOIN-ом
+        # в том же запросе, а не отдельным SELECT
+        "detail": (
+            joinedload(Project.owner).selectinload(User.skills),
+            selectinload(Project.skills),
+        ),
+        "list": (
+            selectinload(Project.owner).selectinload(User.skills),
+            selectinload(Project.skills),
+        ),
+        "for_matching": (selectinload(Project.skills),),
+    },
+    Application: {
+        # ApplicationDetailRead: project (ProjectRead) + applicant (UserRead)
+        "detail": (
+            selectinload(Application.project).selectinload(Project.owner).selectinload(User.skills),
+            selectinload(Application.project).selectinload(Project.skills),
+            selectinload(Application.applicant).selectinload(User.skills),
+        ),
+        # ApplicationRead: только applicant (UserRead)
+        "list": (selectinload(Application.applicant).selectinload(User.skills),),
+        "for_matching": (
+            selectinload(Application.project).selectinload(Project.skills),
+            selectinload(Application.applicant).selectinload(User.skills),
+        ),
+    },
+}
+
+
+def loader_options(model, profile: LoaderProfile) -> tuple:
+    """Опции загрузки связей для модели под нужный профиль"""
+    try:
+        return LOADER_PROFILES[model][profile]
+    except KeyError:
+        raise ValueError(f"Unknown loader profile {profile!r} for {model.__name__}")
 
 
 # ============ USER CRUD ============
@@ -18,20 +88,44 @@ async def create_user(session: AsyncSession, user_data: UserCreate) -> User:
     session.add(db_user)
     await session.commit()
     await session.refresh(db_user, ["skills"])
+
+    user_index.set_skills(db_user.id, ())
     return db_user
 
 
-async def get_user_by_id(session: AsyncSession, user_id: int) -> User | None:
+async def get_user_by_id(
+    session: AsyncSession,
+    user_id: int,
+    profile: LoaderProfile = "detail",
+) -> User | None:
     """Получает юзера по ID с его навыками"""
     stmt = (
         select(User)
         .where(User.id == user_id)
-        .options(selectinload(User.skills))
+        .options(*loader_options(User, profile))
     )
     result = await session.execute(stmt)
     return result.scalar_one_or_none()
 
 
+async def get_users_by_ids(
+    session: AsyncSession,
+    user_ids: list[int],
+    profile: LoaderProfile = "list",
+) -> list[User]:
+    """Получает юзеров по списку ID (в том же порядке, что и ID)"""
+    if not user_ids:
+        return []
+    stmt = (
+        select(User)
+        .where(User.id.in_(user_ids))
+        .options(*loader_options(User, profile))
+    )
+    result = await session.execute(stmt)
+    by_id = {user.id: user for user in result.scalars().all()}
+    return [by_id[user_id] for user_id in user_ids if user_id in by_id]
+
+
 async def get_user_by_username(session: AsyncSession, username: str) -> User | None:
     """Получает юзера по username"""
     stmt = select(User).where(User.username == username)
@@ -39,28 +133,127 @@ async def get_user_by_username(session: AsyncSession, username: str) -> User | N
     return result.scalar_one_or_none()
 
 
-async def add_skills_to_user(
+async def _write_skill_links(
+    session: AsyncSession,
+    table,
+    owner_column: str,
+    owner_id: int,
+    skill_ids: list[int],
+    favorite_skill_ids: list[int] | None = None,
+    replace: bool = False,
+    is_new: bool = False,
+    resolved: bool = False,
+) -> list[int]:
+    """
+    Пишет связи сущность–навык в таблицу `table` пачкой (без коммита).
+
+    Сравнивает запрошенные навыки с уже существующими строками и:
+    - вставляет новые строки одним executemany;
+    - при `favorite_skill_ids` перезаписывает is_favorite у всех навыков;
+    - при `replace=True` удаляет строки, которых нет в `skill_ids`.
+    `is_new=True` — у сущности заведомо нет строк, SELECT не нужен.
+    `resolved=True` — ID уже прошли через skill_catalog.resolve_ids.
+    Возвращает итоговый список ID навыков.
+    """
+    owner = table.c[owner_column]
+    if not resolved:
+        skill_ids = await skill_catalog.resolve_ids(skill_ids)
+    with_favorites = "is_favorite" in table.c
+
+    existing: dict[int, bool] = {}
+    if not is_new:
+        columns = [table.c.skill_id]
+        if with_favorites:
+            columns.append(table.c.is_favorite)
+        result = await session.execute(select(*columns).where(owner == owner_id))
+        existing = {row[0]: (bool(row[1]) if with_favorites else False) for row in result}
+
+    final_ids = skill_ids if replace else list(existing) + [s for s in skill_ids if s not in existing]
+    favorites = set(favorite_skill_ids or ()) & set(final_ids) if with_favorites else set()
+
+    rows = []
+    for skill_id in final_ids:
+        row = {owner_column: owner_id, "skill_id": skill_id}
+        if with_favorites:
+            is_favorite = skill_id in favorites if favorite_skill_ids else existing.get(skill_id, False)
+            row["is_favorite"] = is_favorite
+            if skill_id in existing and existing[skill_id] == is_favorite:
+                continue
+        elif skill_id in existing:
+            continue
+        rows.append(row)
+
+    if rows:
+        stmt = sqlite_insert(table)
+        if with_favorites:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[owner, table.c.skill_id],
+                set_={"is_favorite": stmt.excluded.is_favorite},
+            )
+        await session.execute(stmt, rows)
+
+    if replace:
+        keep = set(final_ids)
+        removed = [skill_id for skill_id in existing if skill_id not in keep]
+        if removed:
+            await session.execute(
+                delete(table).where(owner == owner_id).where(table.c.skill_id.in_(removed))
+            )
+    return final_ids
+
+
+async def set_user_skills(
     session: AsyncSession,
     user_id: int,
     skill_ids: list[int],
     favorite_skill_ids: list[int] | None = None,
+    replace: bool = False,
 ) -> User:
-    """Добавляет навыки юзеру"""
-    if favorite_skill_ids is None:
-        favorite_skill_ids = []
-
-    user = await get_user_by_id(session, user_id)
-    if not user:
+    """
+    Назначает навыки юзеру в одной транзакции.
+    replace=False — добавить к имеющимся, replace=True — заменить весь набор.
+    """
+    final_ids = await _write_skill_links(
+        session,
+        user_skill_association,
+        "user_id",
+        user_id,
+        skill_ids,
+        favorite_skill_ids,
+        replace=replace,
+    )
+    result = await session.execute(
+        update(User).where(User.id == user_id).values(skill_count=len(final_ids))
+    )
+    if result.rowcount == 0:
+        await session.rollback()
         raise ValueError(f"User {user_id} not found")
+    # Владелец с навыками входит в детали его проектов
+    await touch_projects(session, Project.owner_id == user_id)
+    await session.commit()
 
-    for skill_id in skill_ids:
-        skill = await get_skill_by_id(session, skill_id)
-        if skill and skill not in user.skills:
-            user.skills.append(skill)
+    user_index.set_skills(user_id, final_ids)
+    rescore_queue.mark_user(user_id)
+    # В ленте у проекта показан владелец с навыками
+    feed_cache.invalidate()
 
-    await session.commit()
-    await session.refresh(user, ["skills"])
-    return user
+    stmt = (
+        select(User)
+        .where(User.id == user_id)
+        .options(*loader_options(User, "detail"))
+        .execution_options(populate_existing=True)
+    )
+    return (await session.execute(stmt)).scalar_one()
+
+
+async def add_skills_to_user(
+    session: AsyncSession,
+    user_id: int,
+    skill_ids: list[int],
+    favorite_skill_ids: list[int] | None = None,
+) -> User:
+    """Добавляет навыки юзеру"""
+    return await set_user_skills(session, user_id, skill_ids, favorite_skill_ids)
 
 
 # ============ SKILL CRUD ============
@@ -70,6 +263,8 @@ async def create_skill(session: AsyncSession, name: str, category: str = "backen
     session.add(db_skill)
     await session.commit()
     await session.refresh(db_skill)
+
+    skill_catalog.invalidate()
     return db_skill
 
 
@@ -94,122 +289,567 @@ async def get_skill_by_name(session: AsyncSession, name: str) -> Skill | None:
     return result.scalar_one_or_none()
 
 
+# ============ SKILL ID SETS (для скоринга) ============
+def _parse_skill_ids(raw: str | None) -> list[int]:
+    """Разбирает результат group_concat в список ID"""
+    if not raw:
+        return []
+    return [int(skill_id) for skill_id in raw.split(",")]
+
+
+async def get_skill_id_sets(
+    session: AsyncSession,
+    user_ids: list[int] = (),
+    project_ids: list[int] = (),
+) -> tuple[dict[int, list[int]], dict[int, list[int]]]:
+    """
+    Одним сгруппированным запросом получает ID навыков юзеров и проектов.
+    Возвращает ({user_id: [skill_id, ...]}, {project_id: [skill_id, ...]}).
+    Несуществующих юзеров/проектов в словарях не будет.
+    """
+    parts = []
+    if user_ids:
+        parts.append(
+            select(
+                literal("user").label("kind"),
+                User.id.label("id"),
+                func.group_concat(user_skill_association.c.skill_id).label("skill_ids"),
+            )
+            .outerjoin(user_skill_association, user_skill_association.c.user_id == User.id)
+            .where(User.id.in_(user_ids))
+            .group_by(User.id)
+        )
+    if project_ids:
+        parts.append(
+            select(
+                literal("project").label("kind"),
+                Project.id.label("id"),
+                func.group_concat(project_skill_association.c.skill_id).label("skill_ids"),
+            )
+            .outerjoin(project_skill_association, project_skill_association.c.project_id == Project.id)
+            .where(Project.id.in_(project_ids))
+            .group_by(Project.id)
+        )
+
+    users: dict[int, list[int]] = {}
+    projects: dict[int, list[int]] = {}
+    if not parts:
+        return users, projects
+
+    stmt = union_all(*parts) if len(parts) > 1 else parts[0]
+    result = await session.execute(stmt)
+    for kind, entity_id, raw in result:
+        target = users if kind == "user" else projects
+        target[entity_id] = _parse_skill_ids(raw)
+    return users, projects
+
+
 # ============ PROJECT CRUD ============
+async def touch_projects(session: AsyncSession, *criteria) -> set[int]:
+    """
+    Сдвигает updated_at у проектов под условием (без коммита).
+    Зовётся, когда меняется что-то, что видно в проекте: навыки владельца,
+    заявки — чтобы ETag / Last-Modified деталей проекта оставались честными.
+
+    Возвращает owner_id затронутых проектов (тем же UPDATE ... RETURNING) —
+    чьи кэши статистики сбросить после коммита.
+    """
+    result = await session.execute(
+        update(Project).where(*criteria).values(updated_at=utcnow()).returning(Project.owner_id),
+        execution_options={"synchronize_session": False},
+    )
+    return set(result.scalars())
+
+
+async def get_projects_updated_at(session: AsyncSession, project_ids: list[int]) -> dict[int, datetime]:
+    """Только updated_at проектов — для условных GET: {project_id: updated_at}"""
+    if not project_ids:
+        return {}
+    stmt = select(Project.id, Project.updated_at).where(Project.id.in_(project_ids))
+    return dict((await session.execute(stmt)).all())
+
+
 async def create_project(
     session: AsyncSession,
     project_data: ProjectCreate,
     owner_id: int,
 ) -> Project:
     """Создаёт новый проект"""
+    skill_ids = await skill_catalog.resolve_ids(project_data.skill_ids)
     db_project = Project(
         title=project_data.title,
         description=project_data.description,
         owner_id=owner_id,
+        skill_count=len(skill_ids),
     )
     session.add(db_project)
     await session.flush()
 
-    for skill_id in project_data.skill_ids:
-        skill = await get_skill_by_id(session, skill_id)
-        if skill and skill not in db_project.skills:
-            db_project.skills.append(skill)
-
+    await _write_skill_links(
+        session,
+        project_skill_association,
+        "project_id",
+        db_project.id,
+        skill_ids,
+        is_new=True,
+        resolved=True,
+    )
     await session.commit()
-    await session.refresh(db_project, ["skills", "owner"])
-    return db_project
+
+    project_index.upsert(db_project.id, owner_id, skill_ids)
+    feed_cache.invalidate()
+    owner_stats_cache.invalidate(owner_id)
+    return await get_project_by_id(session, db_project.id)
 
 
-async def get_project_by_id(session: AsyncSession, project_id: int) -> Project | None:
+async def get_project_by_id(
+    session: AsyncSession,
+    project_id: int,
+    profile: LoaderProfile = "detail",
+) -> Project | None:
     """Получает проект по ID"""
     stmt = (
         select(Project)
         .where(Project.id == project_id)
-        .options(
-            selectinload(Project.owner).selectinload(User.skills),
-            selectinload(Project.skills),
-            selectinload(Project.applications).selectinload(Application.applicant).selectinload(User.skills),
-        )
+        .options(*loader_options(Project, profile))
     )
     result = await session.execute(stmt)
     return result.scalar_one_or_none()
 
 
+async def get_projects_by_ids(
+    session: AsyncSession,
+    project_ids: list[int],
+    profile: LoaderProfile = "list",
+) -> list[Project]:
+    """Получает проекты по списку ID (в том же порядке, что и ID)"""
+    if not project_ids:
+        return []
+    stmt = (
+        select(Project)
+        .where(Project.id.in_(project_ids))
+        .options(*loader_options(Project, profile))
+    )
+    result = await session.execute(stmt)
+    by_id = {project.id: project for project in result.scalars().all()}
+    return [by_id[project_id] for project_id in project_ids if project_id in by_id]
+
+
+async def get_ranked_projects_for_user(
+    session: AsyncSession,
+    user_id: int,
+    status: str = "open",
+    limit: int = 10,
+) -> list[tuple[Project, float]]:
+    """
+    Ранжирует проекты для юзера целиком внутри SQLite:
+    пересечение навыков через JOIN ... GROUP BY по project_skill/user_skill,
+    сортировка по intersection / sqrt(count_u * count_p), фильтр и LIMIT.
+    Из БД гидрируются только попавшие в top проекты.
+    """
+    user_skills = user_skill_association
+    project_skills = project_skill_association
+
+    matches = (
+        select(
+            project_skills.c.project_id,
+            func.count().label("intersection"),
+        )
+        .join(user_skills, user_skills.c.skill_id == project_skills.c.skill_id)
+        .where(user_skills.c.user_id == user_id)
+        .group_by(project_skills.c.project_id)
+        .subquery()
+    )
+    user_skill_count = select(User.skill_count).where(User.id == user_id).scalar_subquery()
+    score = (matches.c.intersection / func.sqrt(user_skill_count * Project.skill_count)).label("score")
+
+    stmt = (
+        select(Project.id, score)
+        .join(matches, matches.c.project_id == Project.id)
+        .where(Project.status == status)
+        .where(Project.owner_id != user_id)
+        .where(Project.skill_count > 0)
+        .order_by(score.desc(), Project.id)
+        .limit(limit)
+    )
+    ranked = (await session.execute(stmt)).all()
+
+    projects = await get_projects_by_ids(session, [project_id for project_id, _ in ranked])
+    by_id = {project.id: project for project in projects}
+    return [
+        (by_id[project_id], round(score, 2))
+        for project_id, score in ranked
+        if project_id in by_id
+    ]
+
+
+# Вес колонок в BM25: совпадение в заголовке важнее, чем в описании
+SEARCH_TITLE_WEIGHT = 2.0
+SEARCH_DESCRIPTION_WEIGHT = 1.0
+MAX_SEARCH_TERMS = 16
+
+
+def build_fts_query(q: str) -> str:
+    """
+    Строка запроса FTS5 из пользовательского ввода: каждое слово в кавычках
+    и как префикс, все слова обязательны. Синтаксис FTS5 (OR, NEAR, *, ")
+    из ввода не протекает. ValueError, если слов нет.
+    """
+    terms = re.findall(r"\w+", q)[:MAX_SEARCH_TERMS]
+    if not terms:
+        raise ValueError("Search query has no words")
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+async def search_projects(
+    session: AsyncSession,
+    q: str,
+    user_id: int | None = None,
+    status: str = "open",
+    limit: int = 20,
+    text_weight: float = 0.5,
+) -> list[tuple[Project, float, float, float | None]]:
+    """
+    Полнотекстовый поиск проектов по FTS5 (title + description).
+
+    Релевантность — BM25, нормированный к лучшему совпадению (1.0 — лучший).
+    С user_id смешивается с cosine по навыкам (как в get_ranked_projects_for_user):
+    text_weight * релевантность + (1 - text_weight) * совместимость.
+    Ранжирование и LIMIT — внутри SQLite; гидрируются только попавшие в выдачу.
+    Возвращает [(проект, итоговый score, релевантность, совместимость или None)].
+    """
+    fts = literal_column("projects_fts")
+    matched = (
+        select(
+            Project.id,
+            Project.skill_count,
+            func.bm25(fts, SEARCH_TITLE_WEIGHT, SEARCH_DESCRIPTION_WEIGHT).label("rank"),
+        )
+        .select_from(projects_fts)
+        .join(Project, Project.id == projects_fts.c.rowid)
+        .where(fts.op("MATCH")(build_fts_query(q)))
+        .where(Project.status == status)
+        .subquery()
+    )
+    # bm25 отрицательный (меньше — лучше): делим на лучший, получаем (0, 1].
+    # Оконная функция — уровнем выше: bm25() внутри окна SQLite не вычисляет
+    relevance = func.coalesce(matched.c.rank / func.nullif(func.min(matched.c.rank).over(), 0), 1.0)
+    hits = select(matched.c.id, matched.c.skill_count, relevance.label("relevance")).subquery()
+
+    if user_id is None:
+        stmt = (
+            select(hits.c.id, hits.c.relevance, hits.c.relevance, literal(None))
+            .order_by(hits.c.relevance.desc(), hits.c.id)
+            .limit(limit)
+        )
+    else:
+        matches = (
+            select(
+                project_skill_association.c.project_id,
+                func.count().label("intersection"),
+            )
+            .join(user_skill_association, user_skill_association.c.skill_id == project_skill_association.c.skill_id)
+            .where(user_skill_association.c.user_id == user_id)
+            .group_by(project_skill_association.c.project_id)
+            .subquery()
+        )
+        user_skill_count = select(User.skill_count).where(User.id == user_id).scalar_subquery()
+        # Деление на 0 (нет навыков) в SQLite даёт NULL → совместимость 0
+        skill_score = func.coalesce(
+            matches.c.intersection / func.sqrt(user_skill_count * hits.c.skill_count), 0.0,
+        )
+        score = text_weight * hits.c.relevance + (1 - text_weight) * skill_score
+        stmt = (
+            select(hits.c.id, score.label("score"), hits.c.relevance, skill_score)
+            .outerjoin(matches, matches.c.project_id == hits.c.id)
+            .order_by(score.desc(), hits.c.id)
+            .limit(limit)
+        )
+    ranked = (await session.execute(stmt)).all()
+
+    projects = await get_projects_by_ids(session, [row[0] for row in ranked])
+    by_id = {project.id: project for project in projects}
+    return [
+        (
+            by_id[project_id],
+            round(score, 2),
+            round(relevance, 2),
+            None if skill_score is None else round(skill_score, 2),
+        )
+        for project_id, score, relevance, skill_score in ranked
+        if project_id in by_id
+    ]
+
+
+async def update_project_status(
+    session: AsyncSession,
+    project_id: int,
+    new_status: str,
+) -> Project:
+    """Обновляет статус проекта и синхронизирует индекс рекомендаций"""
+    project = await get_project_by_id(session, project_id, profile="for_matching")
+    if not project:
+        raise ValueError(f"Project {project_id} not found")
+
+    project.status = new_status
+    await session.commit()
+
+    if new_status == "open":
+        project_index.upsert(project.id, project.owner_id, [skill.id for skill in project.skills])
+    else:
+        project_index.remove(project.id)
+    feed_cache.invalidate()
+    owner_stats_cache.invalidate(project.owner_id)
+    return await get_project_by_id(session, project_id)
+
+
 async def get_all_projects(
     session: AsyncSession,
     status: str = "open",
     limit: int = 50,
     offset: int = 0,
+    cursor: str | None = None,
+    profile: LoaderProfile = "list",
 ) -> list[Project]:
-    """Получает все проекты"""
+    """
+    Получает все проекты.
+    С `cursor` — keyset-пагинация по (created_at, id), offset оставлен для совместимости.
+    """
     stmt = (
         select(Project)
         .where(Project.status == status)
-        .options(
-            selectinload(Project.owner).selectinload(User.skills),
-            selectinload(Project.skills),
-        )
-        .order_by(Project.created_at.desc())
+        .options(*loader_options(Project, profile))
+        .order_by(Project.created_at.desc(), Project.id.desc())
         .limit(limit)
-        .offset(offset)
     )
+    if cursor:
+        stmt = stmt.where(
+            after_cursor((Project.created_at, Project.id), decode_cursor(cursor, datetime, int))
+        )
+    else:
+        stmt = stmt.offset(offset)
     result = await session.execute(stmt)
     return result.scalars().all()
 
 
-async def get_user_projects(session: AsyncSession, owner_id: int) -> list[Project]:
-    """Получает все проекты конкретного юзера"""
+async def get_user_projects(
+    session: AsyncSession,
+    owner_id: int,
+    limit: int | None = None,
+    cursor: str | None = None,
+    profile: LoaderProfile = "list",
+) -> list[Project]:
+    """Получает проекты конкретного юзера (keyset-пагинация по (created_at, id))"""
     stmt = (
         select(Project)
         .where(Project.owner_id == owner_id)
-        .options(
-            selectinload(Project.skills),
-            selectinload(Project.applications).selectinload(Application.applicant).selectinload(User.skills),
-        )
-        .order_by(Project.created_at.desc())
+        .options(*loader_options(Project, profile))
+        .order_by(Project.created_at.desc(), Project.id.desc())
+        .limit(limit)
     )
+    if cursor:
+        stmt = stmt.where(
+            after_cursor((Project.created_at, Project.id), decode_cursor(cursor, datetime, int))
+        )
     result = await session.execute(stmt)
     return result.scalars().all()
 
 
+# Корзины гистограммы совместимости: [0.0, 0.1), [0.1, 0.2), ..., [0.9, 1.0]
+SCORE_HISTOGRAM_BUCKETS = 10
+
+
+async def get_owner_project_stats(session: AsyncSession, owner_id: int) -> list[dict]:
+    """
+    Статистика заявок по проектам владельца — только агрегаты из GROUP BY,
+    без ORM-объектов: счётчики по статусам, среднее/максимум совместимости
+    и гистограмма по SCORE_HISTOGRAM_BUCKETS корзинам. Два запроса.
+    """
+    def count_status(value: str):
+        return func.count(case((Application.status == value, 1)))
+
+    totals = (
+        select(
+            Project.id,
+            Project.title,
+            Project.status,
+            func.count(Application.id).label("applications_total"),
+            count_status("pending").label("pending"),
+            count_status("accepted").label("accepted"),
+            count_status("rejected").label("rejected"),
+            func.avg(Application.compatibility_score).label("mean_score"),
+            func.max(Application.compatibility_score).label("max_score"),
+        )
+        .outerjoin(Application, Application.project_id == Project.id)
+        .where(Project.owner_id == owner_id)
+        .group_by(Project.id)
+        .order_by(Project.created_at.desc(), Project.id.desc())
+    )
+    stats = {
+        row.id: {
+            "project_id": row.id,
+            "title": row.title,
+            "status": row.status,
+            "applications_total": row.applications_total,
+            "pending": row.pending,
+            "accepted": row.accepted,
+            "rejected": row.rejected,
+            "mean_score": row.mean_score,
+            "max_score": row.max_score,
+            "score_histogram": [0] * SCORE_HISTOGRAM_BUCKETS,
+        }
+        for row in await session.execute(totals)
+    }
+    if not stats:
+        return []
+
+    # min(..., последняя корзина): score = 1.0 попадает в последнюю корзину
+    bucket = func.min(
+        cast(Application.compatibility_score * SCORE_HISTOGRAM_BUCKETS, Integer),
+        SCORE_HISTOGRAM_BUCKETS - 1,
+    )
+    histogram = (
+        select(Application.project_id, bucket, func.count())
+        .join(Project, Project.id == Application.project_id)
+        .where(Project.owner_id == owner_id)
+        .group_by(Application.project_id, bucket)
+    )
+    for project_id, index, count in await session.execute(histogram):
+        stats[project_id]["score_histogram"][index] = count
+    return list(stats.values())
+
+
 # ============ APPLICATION CRUD ============
-async def create_application(
+async def insert_pending_application(
     session: AsyncSession,
     project_id: int,
     applicant_id: int,
     compatibility_score: float,
-) -> Application:
-    """Создаёт новую заявку"""
+) -> tuple[int, datetime]:
+    """
+    Вставляет pending-заявку одним INSERT ... ON CONFLICT DO NOTHING.
+    Дубликаты ловит уникальный частичный индекс, без предварительного SELECT.
+    Возвращает (id, created_at); ValueError, если pending-заявка уже есть.
+    """
     stmt = (
-        select(Application)
-        .where(Application.project_id == project_id)
-        .where(Application.applicant_id == applicant_id)
-        .where(Application.status == "pending")
+        sqlite_insert(Application)
+        .values(
+            project_id=project_id,
+            applicant_id=applicant_id,
+            compatibility_score=compatibility_score,
+            status="pending",
+        )
+        .on_conflict_do_nothing(
+            index_elements=[Application.project_id, Application.applicant_id],
+            index_where=text("status = 'pending'"),
+        )
+        .returning(Application.id, Application.created_at)
     )
-    result = await session.execute(stmt)
-    if result.scalar_one_or_none():
+    row = (await session.execute(stmt)).first()
+    if row is None:
+        await session.rollback()
         raise ValueError("Application already exists")
+    owner_ids = await touch_projects(session, Project.id == project_id)
+    await session.commit()
+    owner_stats_cache.invalidate(*owner_ids)
+    return row.id, row.created_at
+
 
-    db_app = Application(
-        project_id=project_id,
-        applicant_id=applicant_id,
-        compatibility_score=compatibility_score,
-        status="pending",
+async def insert_pending_applications(
+    session: AsyncSession,
+    rows: list[tuple[int, int, float]],
+) -> dict[tuple[int, int], tuple[int, datetime]]:
+    """
+    Пачка pending-заявок (project_id, applicant_id, score) одним многострочным
+    INSERT ... ON CONFLICT DO NOTHING RETURNING и одним коммитом.
+    Возвращает {(project_id, applicant_id): (id, created_at)} для вставленных;
+    пар, которых в ответе нет, — дубликаты.
+    """
+    if not rows:
+        return {}
+    stmt = (
+        sqlite_insert(Application)
+        .values([
+            {
+                "project_id": project_id,
+                "applicant_id": applicant_id,
+                "compatibility_score": score,
+                "status": "pending",
+            }
+            for project_id, applicant_id, score in rows
+        ])
+        .on_conflict_do_nothing(
+            index_elements=[Application.project_id, Application.applicant_id],
+            index_where=text("status = 'pending'"),
+        )
+        .returning(Application.id, Application.created_at, Application.project_id, Application.applicant_id)
     )
-    session.add(db_app)
+    inserted = {
+        (row.project_id, row.applicant_id): (row.id, row.created_at)
+        for row in await session.execute(stmt)
+    }
+    owner_ids = set()
+    if inserted:
+        owner_ids = await touch_projects(session, Project.id.in_({project_id for project_id, _ in inserted}))
     await session.commit()
-    await session.refresh(db_app, ["project", "applicant"])
-    return db_app
+    owner_stats_cache.invalidate(*owner_ids)
+    return inserted
+
+
+async def get_project_owner_and_skill_ids(
+    session: AsyncSession,
+    project_id: int,
+) -> tuple[int, list[int]] | None:
+    """Одним запросом получает owner_id и ID навыков проекта (None, если проекта нет)"""
+    projects = await get_projects_owner_and_skill_ids(session, [project_id])
+    return projects.get(project_id)
+
+
+async def get_projects_owner_and_skill_ids(
+    session: AsyncSession,
+    project_ids: list[int],
+) -> dict[int, tuple[int, list[int]]]:
+    """То же для многих проектов сразу: {project_id: (owner_id, ID навыков)}"""
+    if not project_ids:
+        return {}
+    stmt = (
+        select(Project.id, Project.owner_id, func.group_concat(project_skill_association.c.skill_id))
+        .outerjoin(project_skill_association, project_skill_association.c.project_id == Project.id)
+        .where(Project.id.in_(project_ids))
+        .group_by(Project.id)
+    )
+    return {
+        project_id: (owner_id, _parse_skill_ids(raw))
+        for project_id, owner_id, raw in await session.execute(stmt)
+    }
+
+
+async def create_application(
+    session: AsyncSession,
+    project_id: int,
+    applicant_id: int,
+    compatibility_score: float,
+) -> Application:
+    """Создаёт новую заявку"""
+    app_id, _ = await insert_pending_application(
+        session,
+        project_id,
+        applicant_id,
+        compatibility_score,
+    )
+    return await get_application_by_id(session, app_id, profile="list")
 
 
-async def get_application_by_id(session: AsyncSession, app_id: int) -> Application | None:
+async def get_application_by_id(
+    session: AsyncSession,
+    app_id: int,
+    profile: LoaderProfile = "detail",
+) -> Application | None:
     """Получает заявку по ID"""
     stmt = (
         select(Application)
         .where(Application.id == app_id)
-        .options(
-            selectinload(Application.project).selectinload(Project.skills),
-            selectinload(Application.applicant).selectinload(User.skills),
-        )
+        .options(*loader_options(Application, profile))
     )
     result = await session.execute(stmt)
     return result.scalar_one_or_none()
@@ -219,18 +859,33 @@ async def get_project_applications(
     session: AsyncSession,
     project_id: int,
     status: str = "pending",
+    limit: int | None = None,
+    cursor: str | None = None,
+    profile: LoaderProfile = "detail",
+    min_score: float | None = None,
 ) -> list[Application]:
-    """Получает все заявки на проект"""
+    """
+    Получает заявки на проект (keyset-пагинация по (compatibility_score, id)).
+    Идёт по индексу (project_id, status, compatibility_score, id) в обратном
+    порядке, так что top-k с min_score читает только k строк.
+    """
     stmt = (
         select(Application)
         .where(Application.project_id == project_id)
         .where(Application.status == status)
-        .options(
-            selectinload(Application.applicant).selectinload(User.skills),
-            selectinload(Application.project).selectinload(Project.skills),
-        )
-        .order_by(Application.compatibility_score.desc())
+        .options(*loader_options(Application, profile))
+        .order_by(Application.compatibility_score.desc(), Application.id.desc())
+        .limit(limit)
     )
+    if min_score is not None:
+        stmt = stmt.where(Application.compatibility_score >= min_score)
+    if cursor:
+        stmt = stmt.where(
+            after_cursor(
+                (Application.compatibility_score, Application.id),
+                decode_cursor(cursor, float, int),
+            )
+        )
     result = await session.execute(stmt)
     return result.scalars().all()
 
@@ -241,11 +896,127 @@ async def update_application_status(
     new_status: str,
 ) -> Application:
     """Обновляет статус заявки"""
-    app = await get_application_by_id(session, app_id)
+    app = await get_application_by_id(session, app_id, profile="list")
     if not app:
         raise ValueError(f"Application {app_id} not found")
 
     app.status = new_status
+    owner_ids = await touch_projects(session, Project.id == app.project_id)
     await session.commit()
-    await session.refresh(app, ["project", "applicant"])
+    owner_stats_cache.invalidate(*owner_ids)
     return app
+
+
+async def bulk_update_application_status(
+    session: AsyncSession,
+    new_status: str,
+    app_ids: list[int] | None = None,
+    project_id: int | None = None,
+    below_score: float | None = None,
+) -> list[dict]:
+    """
+    Меняет статус pending-заявок одним UPDATE ... RETURNING в одной транзакции:
+    либо по списку ID, либо все pending-заявки проекта с совместимостью ниже below_score.
+    Возвращает [{"id", "result"}]; для списка ID — по каждому переданному ID.
+    """
+    table = Application.__table__
+    stmt = (
+        update(table)
+        .where(table.c.status == "pending")
+        .values(status=new_status)
+        .returning(table.c.id, table.c.project_id)
+    )
+    if app_ids:
+        stmt = stmt.where(table.c.id.in_(app_ids))
+    else:
+        stmt = stmt.where(table.c.project_id == project_id, table.c.compatibility_score < below_score)
+
+    rows = (await session.execute(stmt)).all()
+    updated_ids = {row.id for row in rows}
+    owner_ids = set()
+    if rows:
+        owner_ids = await touch_projects(session, Project.id.in_({row.project_id for row in rows}))
+    await session.commit()
+    owner_stats_cache.invalidate(*owner_ids)
+
+    if not app_ids:
+        return [{"id": app_id, "result": "updated"} for app_id in sorted(updated_ids)]
+
+    # Почему не обновились остальные: заявки нет или она уже не pending
+    missed = set(app_ids) - updated_ids
+    existing = set()
+    if missed:
+        existing = set((await session.execute(select(table.c.id).where(table.c.id.in_(missed)))).scalars())
+    results = []
+    for app_id in dict.fromkeys(app_ids):
+        if app_id in updated_ids:
+            result = "updated"
+        elif app_id in existing:
+            result = "not_pending"
+        else:
+            result = "not_found"
+        results.append({"id": app_id, "result": result})
+    return results
+
+
+# ============ EXPORT (потоковая выгрузка) ============
+# Плоские строки без ORM-объектов: навыки — списком ID из коррелированного
+# group_concat. Результат читается с сервера пачками по chunk_size строк.
+async def stream_project_rows(
+    session: AsyncSession,
+    status: str | None = None,
+    chunk_size: int = 1000,
+):
+    """Все проекты (опционально по статусу) плоскими словарями, по мере чтения"""
+    skill_ids = (
+        select(func.group_concat(project_skill_association.c.skill_id))
+        .where(project_skill_association.c.project_id == Project.id)
+        .scalar_subquery()
+    )
+    stmt = select(
+        Project.id,
+        Project.title,
+        Project.description,
+        Project.status,
+        Project.owner_id,
+        Project.created_at,
+        Project.updated_at,
+        skill_ids.label("skill_ids"),
+    ).order_by(Project.id)
+    if status is not None:
+        stmt = stmt.where(Project.status == status)
+
+    result = await session.stream(stmt.execution_options(yield_per=chunk_size))
+    async for row in result.mappings():
+        yield {**row, "skill_ids": _parse_skill_ids(row["skill_ids"])}
+
+
+async def stream_application_rows(
+    session: AsyncSession,
+    project_id: int | None = None,
+    status: str | None = None,
+    chunk_size: int = 1000,
+):
+    """Заявки (опционально одного проекта / статуса) плоскими словарями, по мере чтения"""
+    applicant_skill_ids = (
+        select(func.group_concat(user_skill_association.c.skill_id))
+        .where(user_skill_association.c.user_id == Application.applicant_id)
+        .scalar_subquery()
+    )
+    stmt = select(
+        Application.id,
+        Application.project_id,
+        Application.applicant_id,
+        Application.status,
+        Application.compatibility_score,
+        Application.created_at,
+        applicant_skill_ids.label("applicant_skill_ids"),
+    ).order_by(Application.id)
+    if project_id is not None:
+        stmt = stmt.where(Application.project_id == project_id)
+    if status is not None:
+        stmt = stmt.where(Application.status == status)
+
+    result = await session.stream(stmt.execution_options(yield_per=chunk_size))
+    async for row in result.mappings():
+        yield {**row, "applicant_skill_ids": _parse_skill_ids(row["applicant_skill_ids"])}
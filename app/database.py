@@ -1,16 +1,83 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+import asyncio
+import contextvars
+import time
+from collections.abc import Callable, Coroutine
+from contextlib import contextmanager
+from contextvars import ContextVar
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
-import os
+from sqlalchemy import event, inspect, text
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.schema import CreateColumn
+from app.config import settings
 
-# SQLite async URL
-DATABASE_URL = "sqlite+aiosqlite:///./project_matching.db"
+# SQLite async URL (из настроек: DATABASE_URL)
+DATABASE_URL = settings.database_url
 
-# Создаём асинхронный движок
-engine = create_async_engine(
-    DATABASE_URL,
-    echo=False,  # Поставь True если хочешь видеть SQL запросы в консоли
-    future=True,
-)
+
+def _create_engine(pool_size: int) -> AsyncEngine:
+    options = {"echo": settings.database_echo, "future": True}
+    # У in-memory SQLite один StaticPool — параметры пула к нему не применимы.
+    # Для файловой БД aiosqlite по умолчанию берёт NullPool (новое соединение
+    # и все PRAGMA на каждую сессию), поэтому пул задаём явно
+    if ":memory:" not in DATABASE_URL:
+        options.update(
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=pool_size,
+            max_overflow=settings.database_max_overflow,
+            pool_timeout=settings.database_pool_timeout,
+        )
+    if DATABASE_URL.startswith("sqlite"):
+        # Таймаут ожидания блокировки на уровне драйвера (сек.)
+        options["connect_args"] = {"timeout": settings.sqlite_busy_timeout_ms / 1000}
+    return create_async_engine(DATABASE_URL, **options)
+
+
+def _apply_pragmas(dbapi_connection, read_only: bool) -> None:
+    """PRAGMA на новом соединении SQLite"""
+    pragmas = [
+        f"synchronous = {settings.sqlite_synchronous}",
+        f"busy_timeout = {settings.sqlite_busy_timeout_ms}",
+        f"mmap_size = {settings.sqlite_mmap_size}",
+        f"cache_size = -{settings.sqlite_cache_size_kib}",  # отрицательное значение — в KiB
+    ]
+    if read_only:
+        pragmas.append("query_only = ON")
+    else:
+        # journal_mode хранится в самом файле БД, его выставляет пишущий движок
+        pragmas.insert(0, f"journal_mode = {settings.sqlite_journal_mode}")
+
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in pragmas:
+            cursor.execute(f"PRAGMA {pragma}")
+    finally:
+        cursor.close()
+
+
+# Основной (пишущий) движок
+engine = _create_engine(settings.database_pool_size)
+
+# Read-only движок для GET-роутов: в WAL читатели не блокируют писателей,
+# а query_only не даст случайно записать через него.
+# In-memory БД у каждого движка своя (второй увидел бы пустую) — там движок один
+if settings.database_read_engine and ":memory:" not in DATABASE_URL:
+    read_engine = _create_engine(settings.database_read_pool_size)
+else:
+    read_engine = engine
+
+# Все различные движки — на них вешаются хуки подсчёта запросов, метрик и т.п.
+engines = [engine] if read_engine is engine else [engine, read_engine]
+
+if DATABASE_URL.startswith("sqlite"):
+    @event.listens_for(engine.sync_engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        _apply_pragmas(dbapi_connection, read_only=False)
+
+    if read_engine is not engine:
+        @event.listens_for(read_engine.sync_engine, "connect")
+        def _on_read_connect(dbapi_connection, connection_record):
+            _apply_pragmas(dbapi_connection, read_only=True)
 
 # Фабрика сессий (async)
 async_session_maker = async_sessionmaker(
@@ -19,17 +86,100 @@ async_session_maker = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# Фабрика read-only сессий
+read_session_maker = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
 
 # Базовый класс для всех моделей
 class Base(DeclarativeBase):
     pass
 
 
+# ============ ДОВОДКА СХЕМЫ СТАРОЙ БД ============
+# Заполнение новых денормализованных колонок из уже существующих данных
+_COLUMN_BACKFILLS = {
+    ("users", "skill_count"): (
+        "UPDATE users SET skill_count = "
+        "(SELECT count(*) FROM user_skill WHERE user_skill.user_id = users.id)"
+    ),
+    ("projects", "skill_count"): (
+        "UPDATE projects SET skill_count = "
+        "(SELECT count(*) FROM project_skill WHERE project_skill.project_id = projects.id)"
+    ),
+}
+
+# Подготовка данных перед созданием индекса (старые данные могут его нарушать)
+_INDEX_PREPARATIONS = {
+    # До уникального индекса ничто не мешало отправить заявку дважды:
+    # оставляем самую раннюю pending-заявку пары, остальные — дубли
+    "uq_applications_pending_project_applicant": (
+        "DELETE FROM applications WHERE status = 'pending' AND id NOT IN ("
+        "SELECT min(id) FROM applications WHERE status = 'pending' GROUP BY project_id, applicant_id)"
+    ),
+}
+
+
+def _upgrade_schema(connection) -> None:
+    """
+    Догоняет схему БД, созданной прежней версией приложения.
+
+    create_all создаёт только недостающие таблицы (с их индексами), а в уже
+    существующих не добавляет ни колонок, ни индексов — их докатываем здесь.
+    """
+    inspector = inspect(connection)
+    for table in Base.metadata.sorted_tables:
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in columns:
+                continue
+            ddl = CreateColumn(column).compile(dialect=connection.dialect)
+            connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
+            backfill = _COLUMN_BACKFILLS.get((table.name, column.name))
+            if backfill is not None:
+                connection.execute(text(backfill))
+
+        indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in indexes:
+                preparation = _INDEX_PREPARATIONS.get(index.name)
+                if preparation is not None:
+                    connection.execute(text(preparation))
+                index.create(connection)
+
+
+def _fts_out_of_sync(connection) -> bool:
+    """
+    Разошёлся ли projects_fts с projects: сверяем кол-во и максимальный ID
+    проиндексированных строк (projects_fts_docsize — по строке на документ;
+    count(*) по самой external-content таблице читал бы projects).
+    """
+    projects, indexed = connection.execute(text(
+        "SELECT (SELECT count(*) || ':' || ifnull(max(id), 0) FROM projects), "
+        "(SELECT count(*) || ':' || ifnull(max(id), 0) FROM projects_fts_docsize)"
+    )).one()
+    return projects != indexed
+
+
 # Функция для инициализации БД (создаст все таблицы)
 async def init_db():
-    """Создаёт все таблицы при запуске приложения"""
+    """Создаёт все таблицы при запуске приложения (и доводит схему старой БД)"""
+    from app.models import PROJECTS_FTS_DDL
+
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_upgrade_schema)
+
+        # Полнотекстовый индекс проектов. Триггеры создаются заново, если их
+        # снесли вместе с таблицей projects; индекс перестраивается, если он
+        # разошёлся с таблицей (новая БД, пересоздание таблиц, запись без триггеров)
+        for ddl in PROJECTS_FTS_DDL:
+            await conn.exec_driver_sql(ddl)
+        if await conn.run_sync(_fts_out_of_sync):
+            await conn.exec_driver_sql("INSERT INTO projects_fts(projects_fts) VALUES ('rebuild')")
     print("✅ БД инициализирована!")
 
 
@@ -38,3 +188,140 @@ async def get_db():
     """Возвращает сессию для использования в эндпоинтах"""
     async with async_session_maker() as session:
         yield session
+
+
+async def get_read_db():
+    """Read-only сессия для GET-эндпоинтов (писать через неё нельзя)"""
+    async with read_session_maker() as session:
+        yield session
+
+
+# ============ СЧЁТЧИК ЗАПРОСОВ ============
+class QueryCounter:
+    """Сколько SQL-запросов (и сколько секунд в них) выполнено внутри count_queries()"""
+
+    def __init__(self, parent: "QueryCounter | None" = None, deferred: bool = False):
+        self.count = 0
+        self.seconds = 0.0
+        # Внешний счётчик (count_queries могут быть вложены друг в друга)
+        self.parent = parent
+        # Выполненные запросы (statement, executemany, seconds) — только у отложенных пачек
+        self.queries: list[tuple[str, bool, float]] | None = [] if deferred else None
+
+
+QueryListener = Callable[[str, bool, float], None]
+
+_query_counter: ContextVar[QueryCounter | None] = ContextVar("query_counter", default=None)
+# Счётчик общей пачки, чьи запросы ещё не отданы ни одному HTTP-запросу
+_deferred_counter: ContextVar[QueryCounter | None] = ContextVar("deferred_query_counter", default=None)
+_executed_listeners: list[QueryListener] = []
+_charged_listeners: list[QueryListener] = []
+
+
+def on_query_executed(listener: QueryListener) -> QueryListener:
+    """
+    Регистрирует слушателя (statement, executemany, seconds), который
+    вызывается ровно один раз на каждый выполненный запрос — для метрик процесса.
+    """
+    _executed_listeners.append(listener)
+    return listener
+
+
+def on_query_charged(listener: QueryListener) -> QueryListener:
+    """
+    Регистрирует слушателя (statement, executemany, seconds), который вызывается
+    в контексте того, кому запрос засчитан: обычно сразу, а для общих пачек —
+    в charge_queries() у каждого дождавшегося (лог медленных запросов, профиль).
+    """
+    _charged_listeners.append(listener)
+    return listener
+
+
+def _active_counters():
+    counter = _query_counter.get()
+    while counter is not None:
+        yield counter
+        counter = counter.parent
+
+
+def _charge(statement: str, executemany: bool, seconds: float) -> None:
+    for listener in _charged_listeners:
+        listener(statement, executemany, seconds)
+
+
+def _query_started(conn, cursor, statement, parameters, context, executemany):
+    for counter in _active_counters():
+        counter.count += 1
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+def _query_finished(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    for counter in _active_counters():
+        counter.seconds += elapsed
+    for listener in _executed_listeners:
+        listener(statement, executemany, elapsed)
+
+    deferred = _deferred_counter.get()
+    if deferred is not None:
+        deferred.queries.append((statement, executemany, elapsed))
+    else:
+        _charge(statement, executemany, elapsed)
+
+
+def _query_failed(exception_context):
+    # after_cursor_execute не вызовется — снимаем засечку сами
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+
+def charge_queries(spent: QueryCounter) -> None:
+    """
+    Записывает на текущий контекст запросы, выполненные за него в другом.
+
+    Общие пачки (лоадеры, group commit) работают в своём чистом контексте,
+    иначе все их запросы достались бы тому запросу, который пачку открыл.
+    Каждый, кто дождался результата пачки, получает её запросы явно —
+    столько, сколько ему самому стоил бы ответ, — и они же попадают
+    в его лог медленных запросов и профиль.
+    """
+    for counter in _active_counters():
+        counter.count += spent.count
+        counter.seconds += spent.seconds
+    for statement, executemany, seconds in spent.queries or ():
+        _charge(statement, executemany, seconds)
+
+
+for _engine in engines:
+    event.listen(_engine.sync_engine, "before_cursor_execute", _query_started)
+    event.listen(_engine.sync_engine, "after_cursor_execute", _query_finished)
+    event.listen(_engine.sync_engine, "handle_error", _query_failed)
+
+
+@contextmanager
+def count_queries(deferred: bool = False):
+    """
+    Считает запросы к engine в текущем контексте (запросе/задаче).
+
+    deferred=True — для общих пачек: запросы не засчитываются текущему
+    контексту сразу, а копятся в счётчике до charge_queries().
+    """
+    counter = QueryCounter(parent=_query_counter.get(), deferred=deferred)
+    token = _query_counter.set(counter)
+    deferred_token = _deferred_counter.set(counter) if deferred else None
+    try:
+        yield counter
+    finally:
+        if deferred_token is not None:
+            _deferred_counter.reset(deferred_token)
+        _query_counter.reset(token)
+
+
+def run_detached(coro: Coroutine) -> asyncio.Task:
+    """
+    Запускает задачу в чистом контексте: ContextVar-ы запроса, который
+    её создал (счётчики, роут, профиль), в неё не протекают.
+    """
+    # create_task(context=...) появился только в 3.11
+    return contextvars.Context().run(asyncio.get_running_loop().create_task, coro)
@@ -0,0 +1,52 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Request, Response, status
+
+
+# ============ CONDITIONAL GET (ETag / 304) ============
+def is_conditional(request: Request) -> bool:
+    """Есть ли у запроса валидаторы, с которыми может получиться 304"""
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Совпадает ли ETag с одним из значений If-None-Match (слабое сравнение)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {value.strip().removeprefix("W/") for value in header.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def not_modified(headers: dict[str, str]) -> Response:
+    """Пустой ответ 304 с теми же валидаторами, что и у полного ответа"""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+def http_date(value: datetime) -> str:
+    """Дата для Last-Modified (наивные datetime из SQLite считаем UTC)"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def not_modified_since(request: Request, last_modified: datetime) -> bool:
+    """
+    Не менялся ли ресурс после If-Modified-Since.
+    Если есть If-None-Match, If-Modified-Since игнорируется (RFC 9110).
+    """
+    header = request.headers.get("if-modified-since")
+    if not header or "if-none-match" in request.headers:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    # В HTTP-датах нет долей секунды
+    return last_modified.replace(microsecond=0) <= since
@@ -0,0 +1,154 @@
+import asyncio
+from datetime import datetime
+from collections.abc import Awaitable, Callable, Hashable, Mapping
+from typing import Generic, TypeVar
+from app.config import settings
+from app.database import read_session_maker, count_queries, charge_queries, run_detached
+from app.crud import (
+    get_users_by_ids,
+    get_projects_by_ids,
+    get_projects_owner_and_skill_ids,
+    get_projects_updated_at,
+)
+from app.models import User, Project
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+# ============ БАТЧИНГ ЗАГРУЗОК (DataLoader) ============
+class BatchLoader(Generic[K, V]):
+    """
+    Склеивает параллельные загрузки по ID в один запрос `WHERE id IN (...)`.
+
+    load(key) кладёт ключ в текущую пачку; пачка уходит в batch_fn через
+    `window` секунд после первого ключа (или сразу, если набралось max_batch).
+    Все, кто ждёт один и тот же ключ, получают один и тот же результат.
+    Ключ присоединяется только к ещё не отправленной пачке, поэтому
+    результат не старше момента вызова load().
+
+    Пачка выполняется в чистом контексте, а её запросы (счётчик, время,
+    лог медленных запросов, профиль) записываются через charge_queries
+    на каждый дождавшийся запрос.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[K]], Awaitable[Mapping[K, V]]],
+        window: float = settings.loader_window_ms / 1000,
+        max_batch: int = settings.loader_max_batch,
+    ):
+        self.batch_fn = batch_fn
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: dict[K, asyncio.Future] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def load(self, key: K) -> V | None:
+        """Результат для ключа (None, если batch_fn его не вернул)"""
+        future = self._pending.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[key] = loop.create_future()
+            if len(self._pending) >= self.max_batch:
+                self._dispatch()
+            elif self._timer is None:
+                self._timer = loop.call_later(self.window, self._dispatch)
+        # shield: отмена одного ждущего не должна отменять результат для остальных
+        outcome, spent = await asyncio.shield(future)
+        charge_queries(spent)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            # Чистый контекст: пачка не принадлежит запросу, который её открыл
+            task = run_detached(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict[K, asyncio.Future]) -> None:
+        with count_queries(deferred=True) as spent:
+            try:
+                results = await self.batch_fn(list(batch))
+            except Exception as e:
+                outcomes = dict.fromkeys(batch, e)
+            else:
+                outcomes = {key: results.get(key) for key in batch}
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result((outcomes[key], spent))
+
+
+# Загрузчики ходят в БД своей read-only сессией: пачка общая для разных запросов,
+# поэтому отдаются detached-объекты с уже загруженными связями (только для чтения)
+async def _load_users_for_matching(user_ids: list[int]) -> dict[int, User]:
+    async with read_session_maker() as session:
+        users = await get_users_by_ids(session, user_ids, profile="for_matching")
+    return {user.id: user for user in users}
+
+
+async def _load_project_details(project_ids: list[int]) -> dict[int, Project]:
+    async with read_session_maker() as session:
+        projects = await get_projects_by_ids(session, project_ids, profile="detail")
+    return {project.id: project for project in projects}
+
+
+async def _load_project_matching_info(project_ids: list[int]) -> dict[int, tuple[int, list[int]]]:
+    async with read_session_maker() as session:
+        return await get_projects_owner_and_skill_ids(session, project_ids)
+
+
+async def _load_project_updated_at(project_ids: list[int]) -> dict[int, datetime]:
+    async with read_session_maker() as session:
+        return await get_projects_updated_at(session, project_ids)
+
+
+# Общие на процесс: склеивают запросы из параллельных HTTP-запросов
+user_for_matching_loader = BatchLoader(_load_users_for_matching)
+project_detail_loader = BatchLoader(_load_project_details)
+project_matching_loader = BatchLoader(_load_project_matching_info)
+project_updated_at_loader = BatchLoader(_load_project_updated_at)
+
+
+class Loaders:
+    """
+    Лоадеры одного HTTP-запроса: повторная загрузка того же ID внутри
+    запроса не идёт в БД, а берёт уже запущенную/готовую загрузку.
+    """
+
+    def __init__(self):
+        self._memo: dict[tuple[str, Hashable], asyncio.Future] = {}
+
+    def _load(self, name: str, loader: BatchLoader, key: Hashable) -> asyncio.Future:
+        future = self._memo.get((name, key))
+        if future is None:
+            future = self._memo[(name, key)] = asyncio.ensure_future(loader.load(key))
+        return future
+
+    async def user_for_matching(self, user_id: int) -> User | None:
+        """Юзер с навыками (для расчёта совместимости и UserRead)"""
+        return await self._load("user_for_matching", user_for_matching_loader, user_id)
+
+    async def project_detail(self, project_id: int) -> Project | None:
+        """Проект с владельцем и навыками (для ProjectRead)"""
+        return await self._load("project_detail", project_detail_loader, project_id)
+
+    async def project_matching_info(self, project_id: int) -> tuple[int, list[int]] | None:
+        """(owner_id, ID навыков) проекта"""
+        return await self._load("project_matching_info", project_matching_loader, project_id)
+
+    async def project_updated_at(self, project_id: int) -> datetime | None:
+        """updated_at проекта (для ETag / Last-Modified)"""
+        return await self._load("project_updated_at", project_updated_at_loader, project_id)
+
+
+def get_loaders() -> Loaders:
+    """Dependency: свой набор лоадеров на каждый запрос"""
+    return Loaders()
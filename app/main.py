@@ -1,8 +1,14 @@
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 import asyncio
-from app.database import init_db
-from app.routes import auth, projects, applications
+from app.database import init_db, read_session_maker
+from app.skill_index import project_index, user_index
+from app.rescoring import rescore_queue
+from app.write_batching import application_batcher
+from app.metrics import MetricsMiddleware, registry
+from app.profiling import ProfilingMiddleware
+from app.routes import auth, projects, applications, matching, imports, exports, debug
 
 
 app = FastAPI(
@@ -22,6 +28,12 @@ app.add_middleware(
 )
 
 
+# ============ МЕТРИКИ И ПРОФИЛИРОВАНИЕ ============
+# Профайлер внутри метрик: его накладные расходы видны в латентности
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(MetricsMiddleware)
+
+
 # ============ LIFESPAN (Инициализация при запуске) ============
 @app.on_event("startup")
 async def startup_event():
@@ -30,11 +42,33 @@ async def startup_event():
     await init_db()
     print("✅ БД готова!")
 
+    async with read_session_maker() as session:
+        await project_index.rebuild(session)
+        await user_index.rebuild(session)
+    print(
+        f"✅ Индексы рекомендаций загружены "
+        f"({len(project_index)} проектов, {len(user_index)} юзеров с навыками)"
+    )
+
+    await rescore_queue.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Вызывается при остановке приложения"""
+    # Дописываем заявки, которые ещё ждут group commit
+    await application_batcher.drain()
+    await rescore_queue.stop()
+
 
 # ============ МАРШРУТЫ ============
 app.include_router(auth.router)
 app.include_router(projects.router)
 app.include_router(applications.router)
+app.include_router(matching.router)
+app.include_router(imports.router)
+app.include_router(exports.router)
+app.include_router(debug.router)
 
 
 # ============ ROOT ENDPOINT ============
@@ -54,6 +88,12 @@ async def health_check():
     return {"status": "ok"}
 
 
+@app.get("/metrics", tags=["health"], response_class=PlainTextResponse)
+async def metrics():
+    """Метрики в формате Prometheus: латентность, in-flight, SQL на запрос"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+
 # ============ ЗАПУСК ============
 if __name__ == "__main__":
     import uvicorn
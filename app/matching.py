@@ -1,8 +1,67 @@
+import heapq
 import math
+import random
+import time
+from collections.abc import Collection, Iterable, Mapping, Set
+from app.config import settings
 from app.models import User, Project
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
+# ============ ЧИСТОЕ ЯДРО СКОРИНГА ============
+# Синхронные функции над голыми ID навыков: без ORM, без сессии.
+# Первый аргумент — множество (по нему идут проверки `in`),
+# второй — любой массив уникальных ID (список из БД, кортеж и т.п.).
+
+def _overlap(skill_ids: Set[int], other_skill_ids: Iterable[int]) -> int:
+    """Размер пересечения без создания промежуточного множества"""
+    return sum(1 for skill_id in other_skill_ids if skill_id in skill_ids)
+
+
+def cosine_similarity(skill_ids: Set[int], other_skill_ids: Collection[int]) -> float:
+    """Cosine Similarity по двум наборам ID навыков (от 0 до 1)"""
+    if not skill_ids or not other_skill_ids:
+        return 0.0
+
+    intersection = _overlap(skill_ids, other_skill_ids)
+    similarity = intersection / (math.sqrt(len(skill_ids)) * math.sqrt(len(other_skill_ids)))
+    return round(similarity, 2)
+
+
+def jaccard_similarity(skill_ids: Set[int], other_skill_ids: Collection[int]) -> float:
+    """Jaccard Similarity по двум наборам ID навыков (от 0 до 1)"""
+    if not skill_ids and not other_skill_ids:
+        return 1.0
+
+    if not skill_ids or not other_skill_ids:
+        return 0.0
+
+    intersection = _overlap(skill_ids, other_skill_ids)
+    union = len(skill_ids) + len(other_skill_ids) - intersection
+    return round(intersection / union, 2)
+
+
+SCORERS = {
+    "cosine": cosine_similarity,
+    "jaccard": jaccard_similarity,
+}
+
+
+def score_batch(
+    skill_ids: Iterable[int],
+    others: Mapping[int, Collection[int]],
+    metric: str = "cosine",
+) -> dict[int, float]:
+    """
+    Считает совместимость одного набора навыков со многими сразу.
+    Возвращает {id: score} для каждого элемента `others`.
+    """
+    scorer = SCORERS[metric]
+    pivot = frozenset(skill_ids)
+    return {other_id: scorer(pivot, other_skill_ids) for other_id, other_skill_ids in others.items()}
+
+
+# ============ ORM-ОБЁРТКИ ============
 async def calculate_compatibility(
     session: AsyncSession,
     user: User,
@@ -26,25 +85,7 @@ async def calculate_compatibility(
     # Получаем ID навыков проекта
     project_skill_ids = {skill.id for skill in project.skills}
     
-    # Если у проекта нет требований или у юзера нет навыков
-    if not project_skill_ids or not user_skill_ids:
-        return 0.0
-    
-    # Считаем пересечение (точки произведения)
-    intersection = len(user_skill_ids & project_skill_ids)
-    
-    # Считаем длины векторов (||A|| и ||B||)
-    user_magnitude = math.sqrt(len(user_skill_ids))
-    project_magnitude = math.sqrt(len(project_skill_ids))
-    
-    # Cosine Similarity
-    if user_magnitude == 0 or project_magnitude == 0:
-        return 0.0
-    
-    similarity = intersection / (user_magnitude * project_magnitude)
-    
-    # Нормализуем от 0 до 1
-    return round(similarity, 2)
+    return cosine_similarity(user_skill_ids, project_skill_ids)
 
 
 # Альтернативная версия: Jaccard Similarity (если будешь хотеть пересчитать)
@@ -60,14 +101,197 @@ async def calculate_compatibility_jaccard(
     user_skill_ids = {skill.id for skill in user.skills}
     project_skill_ids = {skill.id for skill in project.skills}
     
-    if not project_skill_ids and not user_skill_ids:
-        return 1.0
-    
-    if not project_skill_ids or not user_skill_ids:
-        return 0.0
-    
-    intersection = len(user_skill_ids & project_skill_ids)
-    union = len(user_skill_ids | project_skill_ids)
-    
-    similarity = intersection / union if union > 0 else 0.0
-    return round(similarity, 2)
+    return jaccard_similarity(user_skill_ids, project_skill_ids)
+
+
+# ============ ПРИБЛИЖЁННЫЙ ПОИСК (MinHash + LSH) ============
+# Сигнатура из bands * rows MinHash-значений режется на bands полос.
+# Два набора попадают в общий бакет, если совпала хотя бы одна полоса,
+# вероятность этого ~ 1 - (1 - J^rows)^bands, где J — Jaccard.
+# Больше bands / меньше rows → выше recall и длиннее шорт-лист.
+APPROXIMATE_MATCHING = settings.approximate_matching
+LSH_BANDS = settings.lsh_bands
+LSH_ROWS = settings.lsh_rows
+
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+class MinHashLSH:
+    """MinHash-сигнатуры наборов навыков, разложенные по LSH-бакетам"""
+
+    def __init__(self, bands: int = LSH_BANDS, rows: int = LSH_ROWS, seed: int = 42):
+        self.bands = bands
+        self.rows = rows
+        rng = random.Random(seed)
+        self._hashes = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(bands * rows)
+        ]
+        self._buckets: list[dict[tuple[int, ...], set[int]]] = [{} for _ in range(bands)]
+        self._signatures: dict[int, tuple[int, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def signature(self, skill_ids: Iterable[int]) -> tuple[int, ...]:
+        """MinHash-сигнатура набора (пустой набор → пустая сигнатура)"""
+        skill_ids = list(skill_ids)
+        if not skill_ids:
+            return ()
+        return tuple(
+            min((a * skill_id + b) % _MERSENNE_PRIME for skill_id in skill_ids)
+            for a, b in self._hashes
+        )
+
+    def add(self, item_id: int, skill_ids: Iterable[int]) -> None:
+        """Кладёт набор в бакеты (старая версия набора удаляется)"""
+        self.remove(item_id)
+        signature = self.signature(skill_ids)
+        if not signature:
+            return
+        self._signatures[item_id] = signature
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(key, set()).add(item_id)
+
+    def remove(self, item_id: int) -> None:
+        signature = self._signatures.pop(item_id, None)
+        if signature is None:
+            return
+        for band, key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(item_id)
+                if not bucket:
+                    del self._buckets[band][key]
+
+    def clear(self) -> None:
+        self._signatures.clear()
+        for buckets in self._buckets:
+            buckets.clear()
+
+    def query(self, skill_ids: Iterable[int]) -> set[int]:
+        """Шорт-лист: все наборы, совпавшие с запросом хотя бы в одной полосе"""
+        signature = self.signature(skill_ids)
+        candidates: set[int] = set()
+        if not signature:
+            return candidates
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(key, ()))
+        return candidates
+
+    def _band_keys(self, signature: tuple[int, ...]):
+        for band in range(self.bands):
+            yield signature[band * self.rows:(band + 1) * self.rows]
+
+
+def exact_top_k(
+    skill_ids: Set[int],
+    others: Mapping[int, Collection[int]],
+    k: int,
+) -> list[tuple[int, float]]:
+    """Точный top-k по косинусу среди всех `others` (только score > 0)"""
+    scores = ((cosine_similarity(skill_ids, other), other_id) for other_id, other in others.items())
+    best = heapq.nlargest(k, ((score, other_id) for score, other_id in scores if score > 0))
+    return [(other_id, score) for score, other_id in best]
+
+
+def approximate_top_k(
+    lsh: MinHashLSH,
+    skill_ids: Set[int],
+    others: Mapping[int, Collection[int]],
+    k: int,
+) -> list[tuple[int, float]]:
+    """Top-k по шорт-листу из LSH, пересчитанному точным косинусом"""
+    shortlist = {other_id: others[other_id] for other_id in lsh.query(skill_ids) if other_id in others}
+    return exact_top_k(skill_ids, shortlist, k)
+
+
+def _synthetic_skill_sets(rng: random.Random, count: int, n_skills: int) -> dict[int, frozenset[int]]:
+    """Наборы навыков с «популярными» навыками (веса ~ 1/rank) и 2–12 навыками на набор"""
+    weights = [1 / rank for rank in range(1, n_skills + 1)]
+    skill_ids = list(range(1, n_skills + 1))
+    return {
+        item_id: frozenset(rng.choices(skill_ids, weights, k=rng.randint(2, 12)))
+        for item_id in range(1, count + 1)
+    }
+
+
+def evaluate_lsh_recall(
+    bands: int = LSH_BANDS,
+    rows: int = LSH_ROWS,
+    n_users: int = 200,
+    n_projects: int = 5000,
+    n_skills: int = 300,
+    k: int = 10,
+    seed: int = 0,
+) -> dict:
+    """
+    Сравнивает приближённый поиск с точным на синтетических данных.
+
+    recall@k — доля мест в top-k, которые LSH заполнил проектами не хуже
+    k-го точного результата (так ничьи на границе не штрафуются).
+    """
+    rng = random.Random(seed)
+    projects = _synthetic_skill_sets(rng, n_projects, n_skills)
+    users = _synthetic_skill_sets(rng, n_users, n_skills)
+
+    lsh = MinHashLSH(bands=bands, rows=rows, seed=seed)
+    for project_id, skill_ids in projects.items():
+        lsh.add(project_id, skill_ids)
+
+    hits = expected = shortlist_total = 0
+    exact_seconds = approx_seconds = 0.0
+    for skill_ids in users.values():
+        started = time.perf_counter()
+        exact = exact_top_k(skill_ids, projects, k)
+        exact_seconds += time.perf_counter() - started
+
+        started = time.perf_counter()
+        shortlist_total += len(lsh.query(skill_ids))
+        approx = approximate_top_k(lsh, skill_ids, projects, k)
+        approx_seconds += time.perf_counter() - started
+
+        if exact:
+            threshold = exact[-1][1]
+            expected += len(exact)
+            hits += sum(1 for _, score in approx if score >= threshold)
+
+    return {
+        "bands": bands,
+        "rows": rows,
+        "k": k,
+        "recall": round(hits / expected, 4) if expected else 1.0,
+        "avg_shortlist": round(shortlist_total / n_users, 1),
+        "exact_ms_per_query": round(exact_seconds * 1000 / n_users, 3),
+        "approx_ms_per_query": round(approx_seconds * 1000 / n_users, 3),
+    }
+
+
+# ============ ЗАПУСК ОТЧЁТА ============
+# python -m app.matching --bands 8 16 32 --rows 1 2 4
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Recall MinHash/LSH против точного косинуса")
+    parser.add_argument("--bands", type=int, nargs="+", default=[LSH_BANDS])
+    parser.add_argument("--rows", type=int, nargs="+", default=[LSH_ROWS])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--projects", type=int, default=5000)
+    parser.add_argument("--skills", type=int, default=300)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for bands in args.bands:
+        for rows in args.rows:
+            report = evaluate_lsh_recall(
+                bands=bands,
+                rows=rows,
+                n_users=args.users,
+                n_projects=args.projects,
+                n_skills=args.skills,
+                k=args.k,
+                seed=args.seed,
+            )
+            print(json.dumps(report))
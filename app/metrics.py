@@ -0,0 +1,235 @@
+import bisect
+import logging
+import time
+from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from app.config import settings
+from app.database import count_queries, on_query_executed, on_query_charged
+
+logger = logging.getLogger(__name__)
+
+# Запросы дольше этого порога пишутся в лог вместе с роутом
+SLOW_QUERY_MS = settings.slow_query_ms
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55)
+DB_TIME_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+# ============ МЕТРИКИ В ФОРМАТЕ PROMETHEUS ============
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Registry:
+    """Все метрики процесса; render() отдаёт их в text exposition format"""
+
+    def __init__(self):
+        self._metrics: list["_Metric"] = []
+
+    def register(self, metric: "_Metric") -> None:
+        self._metrics.append(metric)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+class _Metric(ABC):
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (), registry: Registry = registry):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        registry.register(self)
+
+    @abstractmethod
+    def samples(self) -> list[str]:
+        """Строки сэмплов в текстовом формате Prometheus"""
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in sorted(self._values.items())
+        ]
+
+
+class Gauge(Counter):
+    type = "gauge"
+
+    def dec(self, *labels, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, *labels, value: float) -> None:
+        self._values[labels] = value
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, *args, buckets: tuple[float, ...] = LATENCY_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [счётчики по бакетам (не накопительные) + переполнение, сумма, кол-во]
+        self._values: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        state = self._values.get(labels)
+        if state is None:
+            state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        state[0][bisect.bisect_left(self.buckets, value)] += 1
+        state[1] += value
+        state[2] += 1
+
+    def samples(self) -> list[str]:
+        lines = []
+        for labels, (counts, total, count) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                bucket_labels = _format_labels(self.labelnames + ("le",), labels + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            inf_labels = _format_labels(self.labelnames + ("le",), labels + ("+Inf",))
+            lines.append(f"{self.name}_bucket{inf_labels} {count}")
+            plain = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{plain} {_format_value(total)}")
+            lines.append(f"{self.name}_count{plain} {count}")
+        return lines
+
+
+REQUESTS = Counter("http_requests_total", "HTTP requests by route and status", ("method", "route", "status"))
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route"), buckets=LATENCY_BUCKETS,
+)
+IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests being processed right now", ("method",))
+DB_QUERIES = Histogram(
+    "db_queries_per_request", "SQL queries issued per HTTP request", ("method", "route"), buckets=QUERY_COUNT_BUCKETS,
+)
+DB_TIME = Histogram(
+    "db_time_per_request_seconds", "Time spent in SQL per HTTP request", ("method", "route"), buckets=DB_TIME_BUCKETS,
+)
+DB_QUERY_DURATION = Histogram("db_query_duration_seconds", "Duration of a single SQL query", buckets=DB_TIME_BUCKETS)
+SLOW_QUERIES = Counter("db_slow_queries_total", "SQL queries slower than SLOW_QUERY_MS", ("route",))
+
+
+# ============ КОНТЕКСТ ЗАПРОСА ============
+class RequestStats:
+    """Метод и роут текущего HTTP-запроса (живёт в ContextVar на время запроса)"""
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+
+    @property
+    def method(self) -> str:
+        return self.scope["method"]
+
+    @property
+    def route(self) -> str:
+        # Шаблон пути ("/projects/{project_id}"), а не сам путь — иначе метки не ограничены
+        route = self.scope.get("route")
+        return route.path if route is not None else "unmatched"
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+def current_route() -> str:
+    """Роут текущего запроса (или "background" вне запроса)"""
+    stats = _request_stats.get()
+    return f"{stats.method} {stats.route}" if stats is not None else "background"
+
+
+# ============ ХУКИ ЗАПРОСОВ ============
+@on_query_executed
+def _query_finished(statement: str, executemany: bool, seconds: float) -> None:
+    DB_QUERY_DURATION.observe(seconds)
+
+
+@on_query_charged
+def _query_charged(statement: str, executemany: bool, seconds: float) -> None:
+    # Запросы общих пачек приходят сюда в контексте каждого дождавшегося,
+    # поэтому медленный запрос лоадера пишется под роутом, который его ждал
+    if seconds * 1000 >= SLOW_QUERY_MS:
+        route = current_route()
+        SLOW_QUERIES.inc(route)
+        logger.warning(
+            "Slow query (%.1f ms) in %s: %s",
+            seconds * 1000,
+            route,
+            " ".join(statement.split())[:1000],
+        )
+
+
+# ============ MIDDLEWARE ============
+class MetricsMiddleware:
+    """
+    ASGI-middleware: латентность по роутам, in-flight запросы,
+    кол-во SQL-запросов и время в БД на каждый запрос.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = _request_stats.set(stats)
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        method = stats.method
+        IN_FLIGHT.inc(method)
+        started = time.perf_counter()
+        try:
+            with count_queries() as counter:
+                await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            route = stats.route
+            IN_FLIGHT.dec(method)
+            REQUESTS.inc(method, route, str(status_code))
+            REQUEST_DURATION.observe(elapsed, method, route)
+            DB_QUERIES.observe(counter.count, method, route)
+            DB_TIME.observe(counter.seconds, method, route)
+            _request_stats.reset(token)
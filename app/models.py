@@ -1,10 +1,21 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, Float, DateTime, Text, Table
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean, Float, DateTime, Text, Table, Index, text
 from sqlalchemy.orm import relationship, Mapped, mapped_column
-from sqlalchemy.sql import func
-from datetime import datetime
+from sqlalchemy.sql import func, table, column
+from datetime import datetime, timezone
 from app.database import Base
 
 
+def utcnow() -> datetime:
+    """
+    Текущее время в UTC (наивное, как и CURRENT_TIMESTAMP).
+    Проставляем его из Python, чтобы все значения хранились в одном формате
+    с микросекундами — на этом держатся курсоры. Без tzinfo — потому что
+    SQLite его не хранит: иначе только что созданный объект сериализовался бы
+    с зоной, а прочитанный из БД — без неё.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 # ============ ТАБЛИЦА СВЯЗИ MANY-TO-MANY ============
 user_skill_association = Table(
     "user_skill",
@@ -32,6 +43,8 @@ class User(Base):
     full_name: Mapped[str] = mapped_column(String(100))
     bio: Mapped[str | None] = mapped_column(Text, nullable=True)
     timezone: Mapped[str] = mapped_column(String(50), default="UTC")
+    # Денормализованное кол-во навыков (для ранжирования прямо в SQL)
+    skill_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
     
     # Relationships
     skills: Mapped[list["Skill"]] = relationship(
@@ -61,15 +74,19 @@ class Project(Base):
     description: Mapped[str] = mapped_column(Text)
     owner_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
     status: Mapped[str] = mapped_column(String(20), default="open")
+    # Денормализованное кол-во требуемых навыков
+    skill_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
     
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        default=utcnow,
         server_default=func.now()
     )
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        default=utcnow,
         server_default=func.now(),
-        onupdate=func.now()
+        onupdate=utcnow
     )
     
     # Relationships
@@ -83,6 +100,50 @@ class Project(Base):
         backref="projects",
     )
 
+    __table_args__ = (
+        # Лента проектов: WHERE status = ? ORDER BY created_at DESC, id DESC
+        Index("ix_projects_status_created_at_id", "status", "created_at", "id"),
+        # Проекты владельца в том же порядке
+        Index("ix_projects_owner_created_at_id", "owner_id", "created_at", "id"),
+    )
+
+
+# ============ ПОЛНОТЕКСТОВЫЙ ИНДЕКС ПРОЕКТОВ (FTS5) ============
+# External-content таблица: текст не дублируется, FTS5 читает его из projects.
+# Синхронизация — триггерами, поэтому её не обойти ни из ORM, ни из импорта.
+# UPDATE срабатывает только на title/description: touch_projects индекс не трогает.
+projects_fts = table("projects_fts", column("rowid", Integer), column("title"), column("description"))
+
+PROJECTS_FTS_DDL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5(
+        title, description,
+        content='projects', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_ai AFTER INSERT ON projects BEGIN
+        INSERT INTO projects_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_ad AFTER DELETE ON projects BEGIN
+        INSERT INTO projects_fts(projects_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS projects_fts_au AFTER UPDATE OF title, description ON projects BEGIN
+        INSERT INTO projects_fts(projects_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO projects_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+)
+
 
 # ============ ТАБЛИЦА APPLICATIONS ============
 class Application(Base):
@@ -97,9 +158,23 @@ class Application(Base):
     
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
+        default=utcnow,
         server_default=func.now()
     )
     
     # Relationships
     project: Mapped["Project"] = relationship("Project", back_populates="applications")
     applicant: Mapped["User"] = relationship("User", back_populates="applications")
+
+    __table_args__ = (
+        # Заявки на проект: WHERE project_id = ? AND status = ? ORDER BY score DESC, id DESC
+        Index("ix_applications_project_status_score_id", "project_id", "status", "compatibility_score", "id"),
+        # Не больше одной pending-заявки от юзера на проект (цель для ON CONFLICT)
+        Index(
+            "uq_applications_pending_project_applicant",
+            "project_id",
+            "applicant_id",
+            unique=True,
+            sqlite_where=text("status = 'pending'"),
+        ),
+    )
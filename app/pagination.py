@@ -0,0 +1,64 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import tuple_
+
+
+# ============ KEYSET (CURSOR) PAGINATION ============
+# Курсор — непрозрачная для клиента строка: base64 от JSON-списка значений
+# ключа сортировки последней строки страницы, например [created_at, id].
+# Следующая страница берётся условием (col1, col2) < (v1, v2) по индексу,
+# поэтому глубина страницы не влияет на скорость, а новые строки не сдвигают выдачу.
+
+# Одна политика на все постраничные роуты: limit по умолчанию ограничен,
+# курсор следующей страницы — всегда в заголовке X-Next-Cursor
+# (нет заголовка — это последняя страница)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(*values) -> str:
+    """Упаковывает значения ключа сортировки в курсор"""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> tuple:
+    """
+    Распаковывает курсор и приводит значения к `types`.
+    Бросает ValueError, если курсор битый.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    if not isinstance(payload, list) or len(payload) != len(types):
+        raise ValueError("Invalid cursor")
+
+    values = []
+    for value, type_ in zip(payload, types):
+        try:
+            if type_ is datetime:
+                values.append(datetime.fromisoformat(value))
+            else:
+                values.append(type_(value))
+        except (ValueError, TypeError) as e:
+            raise ValueError("Invalid cursor") from e
+    return tuple(values)
+
+
+def after_cursor(columns: tuple, values: tuple):
+    """Условие «строго после курсора» для сортировки по убыванию всех колонок"""
+    return tuple_(*columns) < tuple_(*values)
+
+
+def next_cursor(items: list, limit: int | None, *attrs: str) -> str | None:
+    """Курсор на следующую страницу (None, если страница неполная)"""
+    if not items or limit is None or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(*(getattr(last, attr) for attr in attrs))
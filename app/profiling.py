@@ -0,0 +1,180 @@
+import asyncio
+import cProfile
+import json
+import logging
+import pstats
+import re
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from app.config import settings
+from app.database import on_query_charged
+
+logger = logging.getLogger(__name__)
+
+# Профилирование включается конфигом, а конкретный запрос — заголовком X-Profile: 1
+PROFILING_ENABLED = settings.profiling_enabled
+PROFILE_DIR = Path(settings.profile_dir)
+PROFILE_HEADER = b"x-profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+TOP_FUNCTIONS = 30
+
+# Функции, время в которых считаем сериализацией ответа
+_SERIALIZATION_FUNCTIONS = {
+    ("fastapi/routing.py", "serialize_response"),
+    ("starlette/responses.py", "render"),
+}
+_PROFILE_ID = re.compile(r"^[0-9a-f]{32}$")
+
+
+# ============ ЗАПИСЬ SQL ДЛЯ ПРОФИЛЯ ============
+class _SqlLog:
+    def __init__(self):
+        self.queries: list[dict] = []
+
+
+_sql_log: ContextVar[_SqlLog | None] = ContextVar("profile_sql_log", default=None)
+
+
+@on_query_charged
+def _profile_query(statement: str, executemany: bool, seconds: float) -> None:
+    # Запросы общих пачек (лоадеры) приходят в контексте дождавшегося запроса
+    log = _sql_log.get()
+    if log is None:
+        return
+    log.queries.append({
+        "statement": " ".join(statement.split()),
+        "executemany": executemany,
+        "duration_ms": round(seconds * 1000, 3),
+    })
+
+
+# ============ ОТЧЁТ ============
+def _function_name(key: tuple) -> str:
+    filename, line, name = key
+    return f"{filename}:{line}({name})" if line else name
+
+
+def _summarize(profiler: cProfile.Profile) -> tuple[list[dict], float]:
+    """Топ функций по cumulative time и время сериализации ответа (мс)"""
+    stats = pstats.Stats(profiler).stats
+    top = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:TOP_FUNCTIONS]
+    functions = [
+        {
+            "function": _function_name(key),
+            "ncalls": ncalls,
+            "tottime_ms": round(tottime * 1000, 3),
+            "cumtime_ms": round(cumtime * 1000, 3),
+        }
+        for key, (_, ncalls, tottime, cumtime, _) in top
+    ]
+    serialization = sum(
+        cumtime
+        for (filename, _, name), (_, _, _, cumtime, _) in stats.items()
+        if any(filename.endswith(path) and name == func for path, func in _SERIALIZATION_FUNCTIONS)
+    )
+    return functions, round(serialization * 1000, 3)
+
+
+def _save(profile_id: str, profiler: cProfile.Profile, summary: dict) -> None:
+    PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+    profiler.dump_stats(PROFILE_DIR / f"{profile_id}.pstats")
+    (PROFILE_DIR / f"{profile_id}.json").write_text(json.dumps(summary, indent=2, ensure_ascii=False))
+
+
+def profile_paths(profile_id: str) -> tuple[Path, Path] | None:
+    """Пути к (json, pstats) профиля или None, если ID кривой"""
+    if not _PROFILE_ID.match(profile_id):
+        return None
+    return PROFILE_DIR / f"{profile_id}.json", PROFILE_DIR / f"{profile_id}.pstats"
+
+
+def list_profiles(limit: int = 50) -> list[str]:
+    """ID последних сохранённых профилей, новые первыми"""
+    if not PROFILE_DIR.is_dir():
+        return []
+    files = sorted(PROFILE_DIR.glob("*.json"), key=lambda path: path.stat().st_mtime, reverse=True)
+    return [path.stem for path in files[:limit]]
+
+
+# ============ MIDDLEWARE ============
+class ProfilingMiddleware:
+    """
+    Профилирует отдельный запрос с заголовком `X-Profile: 1` (если PROFILING_ENABLED).
+
+    Запрос выполняется под cProfile, его SQL пишется с таймингами,
+    результат сохраняется в PROFILE_DIR как <id>.pstats + <id>.json,
+    а ID возвращается в заголовке X-Profile-Id.
+
+    cProfile видит весь event loop, поэтому одновременно профилируется
+    только один запрос, а параллельные запросы могут попасть в его профиль.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._busy = False
+
+    async def __call__(self, scope, receive, send):
+        if (
+            not PROFILING_ENABLED
+            or scope["type"] != "http"
+            or dict(scope["headers"]).get(PROFILE_HEADER) not in (b"1", b"true")
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        if self._busy:
+            logger.info("Profiler is busy, serving %s without profiling", scope["path"])
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+        status_code = 500
+
+        async def send_with_profile_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message = {
+                    **message,
+                    "headers": [*message.get("headers", []), (PROFILE_ID_HEADER.lower().encode(), profile_id.encode())],
+                }
+            await send(message)
+
+        self._busy = True
+        sql_log = _SqlLog()
+        token = _sql_log.set(sql_log)
+        profiler = cProfile.Profile()
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        try:
+            profiler.enable()
+            try:
+                await self.app(scope, receive, send_with_profile_id)
+            finally:
+                profiler.disable()
+        finally:
+            total = time.perf_counter() - started
+            _sql_log.reset(token)
+            self._busy = False
+
+            functions, serialization_ms = _summarize(profiler)
+            summary = {
+                "id": profile_id,
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": route.path if (route := scope.get("route")) is not None else None,
+                "status": status_code,
+                "started_at": started_at.isoformat(),
+                "total_ms": round(total * 1000, 3),
+                "serialization_ms": serialization_ms,
+                "sql": {
+                    "count": len(sql_log.queries),
+                    "total_ms": round(sum(query["duration_ms"] for query in sql_log.queries), 3),
+                    "queries": sql_log.queries,
+                },
+                "top_functions": functions,
+            }
+            await asyncio.to_thread(_save, profile_id, profiler, summary)
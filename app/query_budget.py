@@ -0,0 +1,38 @@
+import logging
+from fastapi import Request
+from app.database import count_queries
+
+logger = logging.getLogger(__name__)
+
+
+# ============ БЮДЖЕТ ЗАПРОСОВ НА РОУТ ============
+def query_budget(limit: int):
+    """
+    Dependency: роут обещает уложиться в `limit` SQL-запросов.
+
+    @router.get("/...", dependencies=[Depends(query_budget(3))])
+
+    Проверка идёт на выходе из dependency, а в FastAPI 0.104 это происходит
+    уже после отправки ответа, поэтому превышение только пишется в лог.
+    Сами бюджеты проверяют тесты (tests/test_query_budgets.py).
+    """
+    async def dependency(request: Request):
+        with count_queries() as counter:
+            yield
+        if counter.count > limit:
+            route = request.scope.get("route")
+            path = route.path if route else request.url.path
+            logger.warning("Query budget exceeded for %s %s: %s > %s", request.method, path, counter.count, limit)
+
+    # Чтобы бюджет роута можно было прочитать снаружи (тесты)
+    dependency.limit = limit
+    return dependency
+
+
+def route_budget(route) -> int | None:
+    """Бюджет запросов роута (None, если роут его не объявлял)"""
+    for depends in getattr(route, "dependencies", ()):
+        limit = getattr(depends.dependency, "limit", None)
+        if limit is not None:
+            return limit
+    return None
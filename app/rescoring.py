@@ -0,0 +1,165 @@
+import asyncio
+import logging
+from sqlalchemy import select, update, bindparam
+from app.database import async_session_maker
+from app.matching import cosine_similarity
+from app.models import Application, Project, utcnow
+from app.response_cache import owner_stats_cache
+
+logger = logging.getLogger(__name__)
+
+
+# ============ ФОНОВЫЙ ПЕРЕСЧЁТ СОВМЕСТИМОСТИ ============
+class RescoreQueue:
+    """
+    Пересчитывает compatibility_score у pending-заявок после смены навыков юзера.
+
+    Изменения навыков только помечают юзера как «грязного».
+    Воркер раз в `delay` секунд забирает накопившиеся ID, достаёт только
+    затронутые pending-заявки и обновляет изменившиеся оценки пачками
+    (один UPDATE executemany на `batch_size` заявок).
+
+    Если пересчёт падает (например, БД заблокирована), повторы идут
+    с экспоненциальной задержкой до `max_backoff` секунд, а traceback
+    пишется в лог один раз на серию сбоев.
+    """
+
+    def __init__(self, batch_size: int = 500, delay: float = 0.05, max_backoff: float = 30.0):
+        self.batch_size = batch_size
+        self.delay = delay
+        self.max_backoff = max_backoff
+        self._dirty_users: set[int] = set()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._failures = 0  # сбоев подряд
+
+    def mark_user(self, user_id: int) -> None:
+        """Навыки юзера изменились — его pending-заявки надо пересчитать"""
+        self._dirty_users.add(user_id)
+        self._wakeup.set()
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает воркер, дообработав то, что уже в очереди"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await self.flush()
+
+    async def flush(self) -> int:
+        """Обрабатывает всё накопленное прямо сейчас. Возвращает кол-во обновлённых заявок"""
+        user_ids, self._dirty_users = self._dirty_users, set()
+        if not user_ids:
+            return 0
+        try:
+            return await self.rescore(user_ids)
+        except Exception:
+            # Возвращаем ID в очередь и будим воркер: повтор по расписанию
+            # backoff, а не при следующей, может быть нескорой, пометке
+            self._dirty_users |= user_ids
+            self._wakeup.set()
+            raise
+
+    async def rescore(self, user_ids: set[int]) -> int:
+        """Пересчитывает pending-заявки указанных юзеров"""
+        if not user_ids:
+            return 0
+
+        # crud сам зовёт mark_user(), поэтому импортируем его лениво
+        from app.crud import get_skill_id_sets
+
+        async with async_session_maker() as session:
+            stmt = (
+                select(
+                    Application.id,
+                    Application.applicant_id,
+                    Application.project_id,
+                    Application.compatibility_score,
+                )
+                .where(Application.status == "pending")
+                .where(Application.applicant_id.in_(user_ids))
+            )
+            rows = (await session.execute(stmt)).all()
+            if not rows:
+                return 0
+
+            users, projects = await get_skill_id_sets(
+                session,
+                user_ids=list({row.applicant_id for row in rows}),
+                project_ids=list({row.project_id for row in rows}),
+            )
+            user_skill_sets = {user_id: frozenset(skill_ids) for user_id, skill_ids in users.items()}
+
+            changes = []
+            touched_project_ids = set()
+            for app_id, applicant_id, project_id, old_score in rows:
+                score = cosine_similarity(
+                    user_skill_sets.get(applicant_id, frozenset()),
+                    projects.get(project_id, ()),
+                )
+                if score != old_score:
+                    changes.append({"app_id": app_id, "score": score})
+                    touched_project_ids.add(project_id)
+
+            stmt = (
+                update(Application.__table__)
+                .where(Application.__table__.c.id == bindparam("app_id"))
+                .where(Application.__table__.c.status == "pending")
+                .values(compatibility_score=bindparam("score"))
+            )
+            for start in range(0, len(changes), self.batch_size):
+                await session.execute(stmt, changes[start:start + self.batch_size])
+
+            # Заявки проекта изменились — сдвигаем его updated_at (ETag деталей)
+            owner_ids = set()
+            if touched_project_ids:
+                result = await session.execute(
+                    update(Project.__table__)
+                    .where(Project.__table__.c.id.in_(touched_project_ids))
+                    .values(updated_at=utcnow())
+                    .returning(Project.__table__.c.owner_id)
+                )
+                owner_ids = set(result.scalars())
+            await session.commit()
+            # Совместимость поменялась — статистика владельцев устарела
+            owner_stats_cache.invalidate(*owner_ids)
+            return len(changes)
+
+    def _retry_delay(self) -> float:
+        """Пауза перед следующим проходом: `delay`, после сбоев — вдвое дольше за каждый, до max_backoff"""
+        # Степень ограничена: за долгий простой 2 ** сбоев переполнило бы float
+        return min(self.delay * 2 ** min(self._failures, 32), self.max_backoff)
+
+    async def _run(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            # Даём набежать соседним изменениям, чтобы обработать их одной пачкой
+            await asyncio.sleep(self._retry_delay())
+            self._wakeup.clear()
+            try:
+                updated = await self.flush()
+            except Exception:
+                self._failures += 1
+                if self._failures == 1:
+                    logger.exception("Failed to rescore pending applications, retrying with backoff")
+                else:
+                    logger.debug("Rescoring failed again (%s in a row)", self._failures)
+                continue
+
+            if self._failures:
+                logger.warning("Rescoring recovered after %s failed attempts", self._failures)
+                self._failures = 0
+            if updated:
+                logger.debug("Rescored %s pending applications", updated)
+
+
+# Одна очередь на процесс
+rescore_queue = RescoreQueue()
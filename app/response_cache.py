@@ -0,0 +1,125 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from app.config import settings
+from app.metrics import Counter, Gauge
+
+
+FEED_CACHE_REQUESTS = Counter(
+    "feed_cache_requests_total", "Feed response cache lookups by result", ("result",),
+)
+FEED_CACHE_ENTRIES = Gauge("feed_cache_entries", "Responses currently held in the feed cache")
+OWNER_STATS_CACHE_REQUESTS = Counter(
+    "owner_stats_cache_requests_total", "Owner stats cache lookups by result", ("result",),
+)
+
+
+# ============ КЭШ ОТВЕТОВ ЛЕНТЫ ============
+class ResponseCache:
+    """
+    Ограниченный LRU-кэш готовых (уже сериализованных) ответов с TTL.
+
+    Инвалидация — через счётчик поколений: любая запись, меняющая ленту,
+    зовёт invalidate(). Ответ, который начали строить до инвалидации,
+    в кэш уже не попадёт (put() сверяет поколение).
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._generation = 0
+        # key -> (истекает в, тело, заголовки)
+        self._entries: OrderedDict[Hashable, tuple[float, bytes, dict[str, str]]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+        FEED_CACHE_ENTRIES.set(value=0)
+
+    def get(self, key: Hashable) -> tuple[bytes, dict[str, str]] | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+                FEED_CACHE_ENTRIES.set(value=len(self._entries))
+            FEED_CACHE_REQUESTS.inc("miss")
+            return None
+        self._entries.move_to_end(key)
+        FEED_CACHE_REQUESTS.inc("hit")
+        return entry[1], entry[2]
+
+    def put(self, key: Hashable, generation: int, body: bytes, headers: dict[str, str]) -> None:
+        """Кладёт ответ, если с момента `generation` ничего не инвалидировали"""
+        if generation != self._generation or self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, body, headers)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        FEED_CACHE_ENTRIES.set(value=len(self._entries))
+
+
+# ============ КЭШ С ИНВАЛИДАЦИЕЙ ПО КЛЮЧУ ============
+class KeyedResponseCache:
+    """
+    LRU-кэш готовых ответов с TTL, где инвалидируется только свой ключ
+    (например, статистика одного владельца), а не весь кэш.
+
+    Поколения ведутся по ключу: ответ, начатый до invalidate(key),
+    put() для этого ключа уже не положит.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._generations: dict[Hashable, int] = {}
+        self._entries: OrderedDict[Hashable, tuple[float, bytes]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def generation(self, key: Hashable) -> int:
+        return self._generations.get(key, 0)
+
+    def invalidate(self, *keys: Hashable) -> None:
+        for key in keys:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            self._entries.pop(key, None)
+
+    def get(self, key: Hashable) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            OWNER_STATS_CACHE_REQUESTS.inc("miss")
+            return None
+        self._entries.move_to_end(key)
+        OWNER_STATS_CACHE_REQUESTS.inc("hit")
+        return entry[1]
+
+    def put(self, key: Hashable, generation: int, body: bytes) -> None:
+        """Кладёт ответ, если с момента `generation` ключ не инвалидировали"""
+        if generation != self.generation(key) or self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+# Кэш ленты GET /projects/, один на процесс
+feed_cache = ResponseCache(max_entries=settings.feed_cache_size, ttl=settings.feed_cache_ttl)
+
+# Статистика владельцев GET /projects/owner/{owner_id}/stats, ключ — owner_id.
+# Инвалидируется по владельцам проектов, чьи заявки поменялись (см. crud.touch_projects)
+owner_stats_cache = KeyedResponseCache(
+    max_entries=settings.owner_stats_cache_size,
+    ttl=settings.owner_stats_cache_ttl,
+)
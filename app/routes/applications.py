@@ -1,68 +1,121 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import asyncio
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_db
-from app.schemas import ApplicationCreate, ApplicationRead, ApplicationDetailRead
+from app.database import get_db, get_read_db
+from app.query_budget import query_budget
+from app.schemas import (
+    ApplicationCreate,
+    ApplicationRead,
+    ApplicationDetailRead,
+    ProjectApplicationsPage,
+    ApplicationBulkStatusUpdate,
+    ApplicationBulkStatusRead,
+)
 from app.crud import (
-    get_user_by_id,
-    get_project_by_id,
-    create_application,
+    insert_pending_application,
     get_application_by_id,
     get_project_applications,
     update_application_status,
+    bulk_update_application_status,
 )
 
-from app.matching import calculate_compatibility
+from app.config import settings
+from app.matching import cosine_similarity
+from app.write_batching import application_batcher
+from app.loaders import Loaders, get_loaders
+from app.pagination import NEXT_CURSOR_HEADER, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, next_cursor
 
 router = APIRouter(prefix="/applications", tags=["applications"])
 
 
-@router.post("/", response_model=ApplicationRead, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    response_model=ApplicationRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(query_budget(5))],
+)
 async def submit_application(
     app_data: ApplicationCreate,
     applicant_id: int = Query(...),
     session: AsyncSession = Depends(get_db),
+    loaders: Loaders = Depends(get_loaders),
 ):
     """
     Подаёт заявку на проект с автоматическим расчётом совместимости.
+
+    Лёгкий путь: юзер с навыками, owner_id + ID навыков проекта одним запросом,
+    затем один INSERT ... ON CONFLICT. Число запросов не зависит от того,
+    сколько заявок уже у проекта, а чтения параллельных заявок склеиваются
+    в общие запросы (см. app/loaders.py). С APPLICATION_BATCHING и запись
+    идёт общей пачкой с одним коммитом (см. app/write_batching.py).
     """
-    user = await get_user_by_id(session, applicant_id)
+    user, project = await asyncio.gather(
+        loaders.user_for_matching(applicant_id),
+        loaders.project_matching_info(app_data.project_id),
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found",
         )
 
-    project = await get_project_by_id(session, app_data.project_id)
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found",
         )
+    owner_id, project_skill_ids = project
 
-    if project.owner_id == applicant_id:
+    if owner_id == applicant_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Cannot apply to your own project",
         )
 
     # ГЛАВНОЕ: считаем совместимость
-    compatibility_score = await calculate_compatibility(session, user, project)
+    compatibility_score = cosine_similarity({skill.id for skill in user.skills}, project_skill_ids)
 
-    # Создаём заявку
-    db_app = await create_application(
-        session,
-        app_data.project_id,
-        applicant_id,
-        compatibility_score,
-    )
+    # Создаём заявку: сразу или в общей пачке с параллельными заявками (group commit)
+    try:
+        if settings.application_batching:
+            app_id, created_at = await application_batcher.submit(
+                app_data.project_id,
+                applicant_id,
+                compatibility_score,
+            )
+        else:
+            app_id, created_at = await insert_pending_application(
+                session,
+                app_data.project_id,
+                applicant_id,
+                compatibility_score,
+            )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
 
-    return db_app
+    return {
+        "id": app_id,
+        "project_id": app_data.project_id,
+        "applicant_id": applicant_id,
+        "compatibility_score": compatibility_score,
+        "status": "pending",
+        "created_at": created_at,
+        "applicant": user,
+    }
 
 
-@router.get("/{app_id}", response_model=ApplicationDetailRead)
+@router.get(
+    "/{app_id}",
+    response_model=ApplicationDetailRead,
+    dependencies=[Depends(query_budget(7))],
+)
 async def get_application_detail(
     app_id: int,
-    session: AsyncSession = Depends(get_db),
+    session: AsyncSession = Depends(get_read_db),
 ):
     """
     Получает детали заявки с информацией о юзере и проекте.
@@ -76,19 +129,97 @@ async def get_application_detail(
     return app
 
 
-@router.get("/project/{project_id}", response_model=list[ApplicationDetailRead])
+@router.get(
+    "/project/{project_id}",
+    response_model=list[ApplicationDetailRead],
+    dependencies=[Depends(query_budget(7))],
+)
 async def list_project_applications(
     project_id: int,
-    session: AsyncSession = Depends(get_db),
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description="Курсор из заголовка X-Next-Cursor"),
+    session: AsyncSession = Depends(get_read_db),
 ):
     """
-    Получает все заявки на конкретный проект (отсортированы по совместимости).
+    Получает заявки на конкретный проект (отсортированы по совместимости).
+    Постранично, курсор следующей страницы в `X-Next-Cursor`.
+    Для больших проектов есть `/applications/project/{project_id}/top`.
     """
-    applications = await get_project_applications(session, project_id)
+    try:
+        applications = await get_project_applications(
+            session,
+            project_id,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    cursor = next_cursor(applications, limit, "compatibility_score", "id")
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
     return applications
 
 
-@router.patch("/{app_id}/accept", response_model=ApplicationRead)
+@router.get(
+    "/project/{project_id}/top",
+    response_model=ProjectApplicationsPage,
+    dependencies=[Depends(query_budget(7))],
+)
+async def top_project_applications(
+    project_id: int,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    min_score: float | None = Query(None, ge=0.0, le=1.0, description="Минимальная совместимость"),
+    status_filter: Literal["pending", "accepted", "rejected"] = Query("pending", alias="status"),
+    cursor: str | None = Query(None, description="Курсор из заголовка X-Next-Cursor"),
+    session: AsyncSession = Depends(get_read_db),
+    loaders: Loaders = Depends(get_loaders),
+):
+    """
+    Лучшие кандидаты на проект: проект в ответе один раз,
+    заявки — top-k по совместимости (без вложенного проекта в каждой).
+
+    `min_score` отсекает слабых кандидатов, курсор следующей страницы — в `X-Next-Cursor`.
+    """
+    project = await loaders.project_detail(project_id)
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        )
+
+    try:
+        applications = await get_project_applications(
+            session,
+            project_id,
+            status=status_filter,
+            limit=limit,
+            cursor=cursor,
+            profile="list",
+            min_score=min_score,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    cursor = next_cursor(applications, limit, "compatibility_score", "id")
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    return {"project": project, "applications": applications}
+
+
+@router.patch(
+    "/{app_id}/accept",
+    response_model=ApplicationRead,
+    dependencies=[Depends(query_budget(5))],
+)
 async def accept_application(
     app_id: int,
     session: AsyncSession = Depends(get_db),
@@ -100,7 +231,11 @@ async def accept_application(
     return updated_app
 
 
-@router.patch("/{app_id}/reject", response_model=ApplicationRead)
+@router.patch(
+    "/{app_id}/reject",
+    response_model=ApplicationRead,
+    dependencies=[Depends(query_budget(5))],
+)
 async def reject_application(
     app_id: int,
     session: AsyncSession = Depends(get_db),
@@ -110,3 +245,37 @@ async def reject_application(
     """
     updated_app = await update_application_status(session, app_id, "rejected")
     return updated_app
+
+
+@router.patch(
+    "/bulk-status",
+    response_model=ApplicationBulkStatusRead,
+    dependencies=[Depends(query_budget(4))],
+)
+async def bulk_change_status(
+    update_data: ApplicationBulkStatusUpdate,
+    session: AsyncSession = Depends(get_db),
+):
+    """
+    Принимает или отклоняет много pending-заявок одной транзакцией.
+
+    **Request:**
+    ```
+    {"status": "rejected", "application_ids": [1, 2, 3]}
+    {"status": "rejected", "project_id": 7, "below_score": 0.3}
+    ```
+
+    Для каждого ID возвращается `updated`, `not_pending` или `not_found`.
+    """
+    results = await bulk_update_application_status(
+        session,
+        update_data.status,
+        app_ids=update_data.application_ids,
+        project_id=update_data.project_id,
+        below_score=update_data.below_score,
+    )
+    return {
+        "status": update_data.status,
+        "updated": sum(item["result"] == "updated" for item in results),
+        "results": results,
+    }
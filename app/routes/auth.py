@@ -1,19 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_db
+from app.database import get_db, get_read_db
+from app.query_budget import query_budget
 from app.schemas import UserCreate, UserRead, SkillRead, UserSkillUpdate
 from app.crud import (
     create_user,
     get_user_by_id,
     get_user_by_username,
-    add_skills_to_user,
-    get_all_skills,
+    set_user_skills,
 )
+from app.skill_catalog import skill_catalog
+from app.http_cache import etag_matches, not_modified
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
-@router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/register",
+    response_model=UserRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(query_budget(4))],
+)
 async def register(user_data: UserCreate, session: AsyncSession = Depends(get_db)):
     """
     Регистрирует нового юзера.
@@ -40,8 +47,12 @@ async def register(user_data: UserCreate, session: AsyncSession = Depends(get_db
     return db_user
 
 
-@router.get("/profile/{user_id}", response_model=UserRead)
-async def get_profile(user_id: int, session: AsyncSession = Depends(get_db)):
+@router.get(
+    "/profile/{user_id}",
+    response_model=UserRead,
+    dependencies=[Depends(query_budget(2))],
+)
+async def get_profile(user_id: int, session: AsyncSession = Depends(get_read_db)):
     """
     Получает профиль юзера со всеми его навыками.
     """
@@ -54,7 +65,11 @@ async def get_profile(user_id: int, session: AsyncSession = Depends(get_db)):
     return user
 
 
-@router.post("/profile/{user_id}/skills", response_model=UserRead)
+@router.post(
+    "/profile/{user_id}/skills",
+    response_model=UserRead,
+    dependencies=[Depends(query_budget(7))],
+)
 async def add_skills(
     user_id: int,
     skills_data: UserSkillUpdate,
@@ -73,13 +88,32 @@ async def add_skills(
     
     `favorite_skill_ids` — это топ-3 навыка, которые выводятся первыми на профиле.
     """
-    user = await get_user_by_id(session, user_id)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        )
+    return await _assign_skills(session, user_id, skills_data, replace=False)
+
 
+@router.put(
+    "/profile/{user_id}/skills",
+    response_model=UserRead,
+    dependencies=[Depends(query_budget(8))],
+)
+async def replace_skills(
+    user_id: int,
+    skills_data: UserSkillUpdate,
+    session: AsyncSession = Depends(get_db),
+):
+    """
+    Заменяет весь набор навыков юзера одной транзакцией.
+    Навыки, которых нет в `skill_ids`, удаляются из профиля.
+    """
+    return await _assign_skills(session, user_id, skills_data, replace=True)
+
+
+async def _assign_skills(
+    session: AsyncSession,
+    user_id: int,
+    skills_data: UserSkillUpdate,
+    replace: bool,
+):
     # Валидация: не больше 3 favorite навыков
     if len(skills_data.favorite_skill_ids) > 3:
         raise HTTPException(
@@ -87,20 +121,36 @@ async def add_skills(
             detail="Cannot have more than 3 favorite skills",
         )
 
-    updated_user = await add_skills_to_user(
-        session,
-        user_id,
-        skills_data.skill_ids,
-        skills_data.favorite_skill_ids,
-    )
-    return updated_user
+    try:
+        return await set_user_skills(
+            session,
+            user_id,
+            skills_data.skill_ids,
+            skills_data.favorite_skill_ids,
+            replace=replace,
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
 
 
-@router.get("/skills", response_model=list[SkillRead])
-async def list_skills(session: AsyncSession = Depends(get_db)):
+@router.get(
+    "/skills",
+    response_model=list[SkillRead],
+    dependencies=[Depends(query_budget(1))],
+)
+async def list_skills(request: Request):
     """
     Получает список всех доступных навыков.
     Используется в выпадающем списке на фронте.
+
+    Ответ отдаётся из in-process кэша с `ETag`;
+    при совпадении `If-None-Match` возвращается `304 Not Modified`.
     """
-    skills = await get_all_skills(session)
-    return skills
+    catalog = await skill_catalog.snapshot()
+    headers = {"ETag": catalog.etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, catalog.etag):
+        return not_modified(headers)
+    return Response(content=catalog.body, media_type="application/json", headers=headers)
@@ -0,0 +1,50 @@
+import json
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import FileResponse
+from app.profiling import PROFILING_ENABLED, profile_paths, list_profiles
+
+router = APIRouter(prefix="/debug/profiles", tags=["debug"])
+
+
+def _require_profiling():
+    if not PROFILING_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profiling is disabled",
+        )
+
+
+@router.get("/")
+async def get_profiles(limit: int = 50):
+    """ID последних сохранённых профилей (новые первыми)"""
+    _require_profiling()
+    return list_profiles(limit)
+
+
+@router.get("/{profile_id}")
+async def get_profile(profile_id: str):
+    """
+    JSON-сводка профиля: топ функций, список SQL с таймингами,
+    время сериализации ответа.
+    """
+    _require_profiling()
+    paths = profile_paths(profile_id)
+    if paths is None or not paths[0].exists():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found",
+        )
+    return json.loads(paths[0].read_text())
+
+
+@router.get("/{profile_id}/pstats")
+async def get_profile_pstats(profile_id: str):
+    """Сырой pstats-файл (python -m pstats / snakeviz)"""
+    _require_profiling()
+    paths = profile_paths(profile_id)
+    if paths is None or not paths[1].exists():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found",
+        )
+    return FileResponse(paths[1], media_type="application/octet-stream", filename=f"{profile_id}.pstats")
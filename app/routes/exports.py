@@ -0,0 +1,66 @@
+from typing import Literal
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from app.database import read_session_maker
+from app.crud import stream_project_rows, stream_application_rows
+from app.streaming import ndjson_stream, csv_stream
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+ExportFormat = Literal["ndjson", "csv"]
+
+PROJECT_COLUMNS = ["id", "title", "description", "status", "owner_id", "created_at", "updated_at", "skill_ids"]
+APPLICATION_COLUMNS = [
+    "id", "project_id", "applicant_id", "status", "compatibility_score", "created_at", "applicant_skill_ids",
+]
+
+
+def _export_response(rows, columns: list[str], format: ExportFormat, filename: str) -> StreamingResponse:
+    if format == "csv":
+        body, media_type = csv_stream(rows, columns), "text/csv"
+    else:
+        body, media_type = ndjson_stream(rows), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'},
+    )
+
+
+@router.get("/projects")
+async def export_projects(
+    format: ExportFormat = "ndjson",
+    status_filter: Literal["open", "in_progress", "closed"] | None = Query(None, alias="status"),
+):
+    """
+    Выгрузка всех проектов плоскими строками (NDJSON или CSV).
+
+    Строки читаются из БД пачками и отправляются по мере чтения,
+    навыки — списком ID (`skill_ids`), без вложенных объектов.
+    """
+    async def rows():
+        # Своя сессия: она должна жить, пока идёт стриминг ответа
+        async with read_session_maker() as session:
+            async for row in stream_project_rows(session, status=status_filter):
+                yield row
+
+    return _export_response(rows(), PROJECT_COLUMNS, format, "projects")
+
+
+@router.get("/applications")
+async def export_applications(
+    project_id: int | None = None,
+    format: ExportFormat = "ndjson",
+    status_filter: Literal["pending", "accepted", "rejected"] | None = Query(None, alias="status"),
+):
+    """
+    Выгрузка заявок (всех или одного проекта) плоскими строками (NDJSON или CSV).
+
+    Вместо вложенного профиля кандидата — `applicant_id` и `applicant_skill_ids`.
+    """
+    async def rows():
+        async with read_session_maker() as session:
+            async for row in stream_application_rows(session, project_id=project_id, status=status_filter):
+                yield row
+
+    return _export_response(rows(), APPLICATION_COLUMNS, format, "applications")
@@ -0,0 +1,34 @@
+import json
+from fastapi import APIRouter, Query, Request
+from app.bulk_import import import_ndjson, DEFAULT_BATCH_SIZE
+from app.streaming import iter_lines, BodyStreamingResponse
+
+router = APIRouter(prefix="/import", tags=["import"])
+
+
+@router.post("/ndjson")
+async def import_ndjson_endpoint(
+    request: Request,
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=5000),
+):
+    """
+    Массовый импорт навыков, юзеров и проектов из NDJSON (одна запись на строку).
+
+    **Request body:**
+    ```
+    {"type": "skill", "name": "Python", "category": "backend"}
+    {"type": "user", "username": "john_dev", "email": "john@example.com", "full_name": "John", "skill_ids": [1]}
+    {"type": "project", "owner_username": "john_dev", "title": "...", "description": "...", "skill_ids": [1]}
+    ```
+
+    Тело читается потоком, записи пишутся пачками по `batch_size`
+    (одна транзакция на пачку), так что в памяти не больше одной пачки.
+    Ответ — NDJSON-отчёт: ошибки по строкам, итог каждой пачки
+    и итоговая строка `{"status": "done", ...}`.
+    """
+    async def reports():
+        async for report in import_ndjson(iter_lines(request.stream()), batch_size):
+            yield json.dumps(report, ensure_ascii=False) + "\n"
+
+    # Отчёт уходит клиенту по мере коммита пачек, пока тело ещё дочитывается
+    return BodyStreamingResponse(reports(), media_type="application/x-ndjson")
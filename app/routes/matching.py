@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_read_db
+from app.query_budget import query_budget
+from app.schemas import ScoreBatchRequest, ScoreBatchRead
+from app.crud import get_skill_id_sets
+from app.matching import score_batch
+
+router = APIRouter(prefix="/matching", tags=["matching"])
+
+
+@router.post(
+    "/score-batch",
+    response_model=ScoreBatchRead,
+    dependencies=[Depends(query_budget(1))],
+)
+async def score_batch_endpoint(
+    request: ScoreBatchRequest,
+    session: AsyncSession = Depends(get_read_db),
+):
+    """
+    Считает совместимость одного юзера со многими проектами (или наоборот).
+
+    **Request:**
+    ```
+    {
+        "user_id": 1,
+        "project_ids": [3, 5, 8],
+        "metric": "cosine"
+    }
+    ```
+
+    Все ID навыков достаются одним запросом, скоринг идёт без ORM-объектов.
+    """
+    if request.user_id is not None:
+        users, others = await get_skill_id_sets(
+            session,
+            user_ids=[request.user_id],
+            project_ids=request.project_ids,
+        )
+        pivot = users.get(request.user_id)
+        requested_ids = request.project_ids
+        not_found = "User not found"
+    else:
+        others, projects = await get_skill_id_sets(
+            session,
+            user_ids=request.user_ids,
+            project_ids=[request.project_id],
+        )
+        pivot = projects.get(request.project_id)
+        requested_ids = request.user_ids
+        not_found = "Project not found"
+
+    if pivot is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=not_found,
+        )
+
+    scores = score_batch(pivot, others, request.metric)
+    requested_ids = list(dict.fromkeys(requested_ids))
+    return {
+        "metric": request.metric,
+        "user_id": request.user_id,
+        "project_id": request.project_id,
+        "scores": [
+            {"id": entity_id, "compatibility_score": scores[entity_id]}
+            for entity_id in requested_ids
+            if entity_id in scores
+        ],
+        "missing_ids": [entity_id for entity_id in requested_ids if entity_id not in scores],
+    }
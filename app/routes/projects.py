@@ -1,18 +1,50 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from datetime import datetime
+from typing import Literal
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import get_db
-from app.schemas import ProjectCreate, ProjectRead, ProjectListRead
+from pydantic import TypeAdapter
+from app.database import get_db, get_read_db
+from app.query_budget import query_budget
+from app.schemas import (
+    ProjectCreate,
+    ProjectRead,
+    ProjectListRead,
+    ProjectStatusUpdate,
+    ProjectRecommendationRead,
+    CandidateRead,
+    OwnerStatsRead,
+    ProjectSearchResultRead,
+)
 from app.crud import (
     create_project,
     get_project_by_id,
+    get_projects_by_ids,
+    get_ranked_projects_for_user,
+    search_projects,
     get_all_projects,
     get_user_projects,
+    get_owner_project_stats,
+    get_user_by_id,
+    get_users_by_ids,
+    update_project_status,
 )
+from app.skill_index import project_index, user_index
+from app.response_cache import feed_cache, owner_stats_cache
+from app.loaders import Loaders, get_loaders
+from app.pagination import NEXT_CURSOR_HEADER, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, next_cursor
+from app.http_cache import is_conditional, etag_matches, not_modified, not_modified_since, http_date
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
+_feed_adapter = TypeAdapter(list[ProjectListRead])
+
 
-@router.post("/", response_model=ProjectRead, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    response_model=ProjectRead,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(query_budget(7))],
+)
 async def create_new_project(
     project_data: ProjectCreate,
     owner_id: int = Query(..., description="ID юзера, который создает проект"),
@@ -36,45 +68,323 @@ async def create_new_project(
     return db_project
 
 
-@router.get("/", response_model=list[ProjectListRead])
+@router.get(
+    "/",
+    response_model=list[ProjectListRead],
+    dependencies=[Depends(query_budget(4))],
+)
 async def list_projects(
     status_filter: str = Query("open", description="Фильтр по статусу (open/closed/in_progress)"),
-    limit: int = Query(50, ge=1, le=100),
-    offset: int = Query(0, ge=0),
-    session: AsyncSession = Depends(get_db),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0, description="Устарело, используйте cursor"),
+    cursor: str | None = Query(None, description="Курсор из заголовка X-Next-Cursor"),
+    session: AsyncSession = Depends(get_read_db),
 ):
     """
     Получает список всех проектов с фильтром по статусу.
     Используется для ленты на главной странице.
+
+    Курсор следующей страницы приходит в заголовке `X-Next-Cursor`.
+    Готовые ответы кэшируются (LRU + TTL) до следующего изменения ленты.
     """
-    projects = await get_all_projects(session, status=status_filter, limit=limit, offset=offset)
-    return projects
+    if cursor and offset:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either cursor or offset",
+        )
+
+    key = (status_filter, limit, cursor, offset)
+    cached = feed_cache.get(key)
+    if cached is not None:
+        body, headers = cached
+        return Response(content=body, media_type="application/json", headers={**headers, "X-Cache": "HIT"})
+
+    # Поколение берём до запроса: если ленту изменят, пока мы читаем, ответ не закэшируется
+    generation = feed_cache.generation
+    try:
+        projects = await get_all_projects(
+            session,
+            status=status_filter,
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
 
+    headers = {}
+    cursor = next_cursor(projects, limit, "created_at", "id")
+    if cursor:
+        headers[NEXT_CURSOR_HEADER] = cursor
+    body = _feed_adapter.dump_json(_feed_adapter.validate_python(projects, from_attributes=True))
+    feed_cache.put(key, generation, body, headers)
+    return Response(content=body, media_type="application/json", headers={**headers, "X-Cache": "MISS"})
 
-@router.get("/{project_id}", response_model=ProjectRead)
+
+@router.get(
+    "/recommended/{user_id}",
+    response_model=list[ProjectRecommendationRead],
+    dependencies=[Depends(query_budget(7))],
+)
+async def recommend_projects(
+    user_id: int,
+    k: int = Query(10, ge=1, le=100, description="Сколько проектов вернуть"),
+    status_filter: str = Query("open", description="Фильтр по статусу (open/closed/in_progress)"),
+    engine: Literal["index", "sql"] = Query("index", description="Где считать ранжирование"),
+    approximate: bool = Query(False, description="Шорт-лист через MinHash/LSH (только engine=index)"),
+    session: AsyncSession = Depends(get_read_db),
+):
+    """
+    Подбирает проекты, которые лучше всего подходят юзеру по навыкам.
+
+    - `index` — скоринг по in-memory индексу открытых проектов;
+    - `sql` — ранжирование целиком в SQLite по денормализованным skill_count.
+
+    Для статусов, отличных от open, всегда используется `sql`.
+    `approximate` работает, только если включён APPROXIMATE_MATCHING.
+    """
+    user = await get_user_by_id(session, user_id, profile="for_matching")
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+
+    if engine == "sql" or status_filter != "open":
+        ranked = await get_ranked_projects_for_user(session, user_id, status=status_filter, limit=k)
+        return [
+            {"project": project, "compatibility_score": score}
+            for project, score in ranked
+        ]
+
+    await project_index.ensure_loaded(session)
+    ranked = project_index.top_k(
+        [skill.id for skill in user.skills],
+        k,
+        exclude_owner_id=user_id,
+        approximate=approximate,
+    )
+    projects = await get_projects_by_ids(session, [project_id for project_id, _ in ranked])
+    by_id = {project.id: project for project in projects}
+    return [
+        {"project": by_id[project_id], "compatibility_score": score}
+        for project_id, score in ranked
+        if project_id in by_id
+    ]
+
+
+# Объявлен до /{project_id}, иначе "search" разбирался бы как project_id
+@router.get(
+    "/search",
+    response_model=list[ProjectSearchResultRead],
+    dependencies=[Depends(query_budget(5))],
+)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Слова для поиска в заголовке и описании"),
+    user_id: int | None = Query(None, description="Учесть совместимость навыков этого юзера"),
+    status_filter: str = Query("open", description="Фильтр по статусу (open/closed/in_progress)"),
+    limit: int = Query(20, ge=1, le=100),
+    text_weight: float = Query(0.5, ge=0.0, le=1.0, description="Вес текстовой релевантности при user_id"),
+    session: AsyncSession = Depends(get_read_db),
+):
+    """
+    Полнотекстовый поиск проектов (SQLite FTS5, ранжирование BM25).
+
+    Все слова запроса обязательны и ищутся как префиксы.
+    С `user_id` релевантность смешивается с совместимостью по навыкам:
+    `text_weight * text_score + (1 - text_weight) * compatibility_score`.
+    """
+    try:
+        results = await search_projects(
+            session,
+            q,
+            user_id=user_id,
+            status=status_filter,
+            limit=limit,
+            text_weight=text_weight,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    return [
+        {
+            "project": project,
+            "score": score,
+            "text_score": relevance,
+            "compatibility_score": skill_score,
+        }
+        for project, score, relevance, skill_score in results
+    ]
+
+
+@router.get(
+    "/{project_id}",
+    response_model=ProjectRead,
+    dependencies=[Depends(query_budget(5))],
+)
 async def get_project_detail(
     project_id: int,
-    session: AsyncSession = Depends(get_db),
+    request: Request,
+    response: Response,
+    loaders: Loaders = Depends(get_loaders),
 ):
     """
     Получает детали конкретного проекта.
+    Параллельные запросы деталей склеиваются в один запрос к БД.
+
+    Отдаёт `ETag` и `Last-Modified`. Условный запрос (`If-None-Match` /
+    `If-Modified-Since`) сначала сверяется по одному `updated_at` и при
+    совпадении получает `304 Not Modified`, не загружая владельца и навыки;
+    безусловный сразу грузит проект целиком.
     """
-    project = await get_project_by_id(session, project_id)
+    if is_conditional(request):
+        updated_at = await loaders.project_updated_at(project_id)
+        if updated_at is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Project not found",
+            )
+        headers = _project_validators(project_id, updated_at)
+        if etag_matches(request, headers["ETag"]) or not_modified_since(request, updated_at):
+            return not_modified(headers)
+
+    project = await loaders.project_detail(project_id)
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found",
         )
+    # Валидаторы — по той версии, которую реально отдаём
+    response.headers.update(_project_validators(project.id, project.updated_at))
     return project
 
 
-@router.get("/owner/{owner_id}", response_model=list[ProjectListRead])
+def _project_validators(project_id: int, updated_at: datetime) -> dict[str, str]:
+    """ETag и Last-Modified деталей проекта: обе производные от updated_at"""
+    return {
+        "ETag": f'"project-{project_id}-{updated_at:%Y%m%d%H%M%S%f}"',
+        "Last-Modified": http_date(updated_at),
+        "Cache-Control": "no-cache",
+    }
+
+
+@router.get(
+    "/{project_id}/candidates",
+    response_model=list[CandidateRead],
+    dependencies=[Depends(query_budget(5))],
+)
+async def recommend_candidates(
+    project_id: int,
+    k: int = Query(10, ge=1, le=100, description="Сколько кандидатов вернуть"),
+    approximate: bool = Query(False, description="Шорт-лист через MinHash/LSH"),
+    session: AsyncSession = Depends(get_read_db),
+):
+    """
+    Подбирает юзеров, которых стоит пригласить в проект.
+    Кандидаты берутся из обратного индекса навык → юзеры.
+    """
+    project = await get_project_by_id(session, project_id, profile="for_matching")
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found",
+        )
+
+    await user_index.ensure_loaded(session)
+    ranked = user_index.top_k(
+        [skill.id for skill in project.skills],
+        k,
+        exclude_user_id=project.owner_id,
+        approximate=approximate,
+    )
+    users = await get_users_by_ids(session, [user_id for user_id, _ in ranked])
+    by_id = {user.id: user for user in users}
+    return [
+        {"user": by_id[user_id], "compatibility_score": score}
+        for user_id, score in ranked
+        if user_id in by_id
+    ]
+
+
+@router.get(
+    "/owner/{owner_id}",
+    response_model=list[ProjectListRead],
+    dependencies=[Depends(query_budget(4))],
+)
 async def get_my_projects(
     owner_id: int,
-    session: AsyncSession = Depends(get_db),
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description="Курсор из заголовка X-Next-Cursor"),
+    session: AsyncSession = Depends(get_read_db),
 ):
     """
-    Получает все проекты конкретного юзера.
+    Получает проекты конкретного юзера (постранично, курсор в `X-Next-Cursor`).
     """
-    projects = await get_user_projects(session, owner_id)
+    try:
+        projects = await get_user_projects(session, owner_id, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+
+    cursor = next_cursor(projects, limit, "created_at", "id")
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
     return projects
+
+
+@router.get(
+    "/owner/{owner_id}/stats",
+    response_model=OwnerStatsRead,
+    dependencies=[Depends(query_budget(2))],
+)
+async def get_owner_stats(
+    owner_id: int,
+    session: AsyncSession = Depends(get_read_db),
+):
+    """
+    Статистика заявок по проектам владельца: счётчики по статусам,
+    средняя/максимальная совместимость и гистограмма (корзины по 0.1).
+
+    Считается агрегатами в SQL и кэшируется по владельцу до изменения
+    заявок на любой из его проектов.
+    """
+    cached = owner_stats_cache.get(owner_id)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json", headers={"X-Cache": "HIT"})
+
+    generation = owner_stats_cache.generation(owner_id)
+    projects = await get_owner_project_stats(session, owner_id)
+    body = OwnerStatsRead(owner_id=owner_id, projects=projects).model_dump_json().encode()
+    owner_stats_cache.put(owner_id, generation, body)
+    return Response(content=body, media_type="application/json", headers={"X-Cache": "MISS"})
+
+
+@router.patch(
+    "/{project_id}/status",
+    response_model=ProjectRead,
+    dependencies=[Depends(query_budget(7))],
+)
+async def change_project_status(
+    project_id: int,
+    status_data: ProjectStatusUpdate,
+    session: AsyncSession = Depends(get_db),
+):
+    """
+    Меняет статус проекта (open / in_progress / closed).
+    """
+    try:
+        project = await update_project_status(session, project_id, status_data.status)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        )
+    return project
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, model_validator
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Literal
 
 
 # ============ SKILL SCHEMAS ============
@@ -87,6 +87,51 @@ class ProjectListRead(BaseModel):
     skills: List[SkillRead] = []
 
 
+class ProjectStatusUpdate(BaseModel):
+    """Схема для смены статуса проекта"""
+    status: Literal["open", "in_progress", "closed"]
+
+
+class ProjectRecommendationRead(BaseModel):
+    """Схема для рекомендованного юзеру проекта"""
+    compatibility_score: float = Field(..., ge=0.0, le=1.0)
+    project: ProjectListRead
+
+
+class ProjectSearchResultRead(BaseModel):
+    """Схема для результата полнотекстового поиска проектов"""
+    score: float  # Итоговый: релевантность, смешанная с совместимостью (если передан user_id)
+    text_score: float = Field(..., ge=0.0, le=1.0)  # BM25, нормированный к лучшему совпадению
+    compatibility_score: Optional[float] = Field(None, ge=0.0, le=1.0)
+    project: ProjectListRead
+
+
+class CandidateRead(BaseModel):
+    """Схема для юзера, которого стоит пригласить в проект"""
+    compatibility_score: float = Field(..., ge=0.0, le=1.0)
+    user: UserRead
+
+
+class ProjectStatsRead(BaseModel):
+    """Агрегаты по заявкам одного проекта (дашборд владельца)"""
+    project_id: int
+    title: str
+    status: str
+    applications_total: int
+    pending: int
+    accepted: int
+    rejected: int
+    mean_score: Optional[float] = None  # None, если заявок нет
+    max_score: Optional[float] = None
+    score_histogram: List[int]  # Кол-во заявок по корзинам совместимости шириной 0.1
+
+
+class OwnerStatsRead(BaseModel):
+    """Статистика по всем проектам владельца"""
+    owner_id: int
+    projects: List[ProjectStatsRead]
+
+
 # ============ APPLICATION SCHEMAS ============
 class ApplicationCreate(BaseModel):
     """Схема для подачи заявки на проект"""
@@ -110,3 +155,113 @@ class ApplicationDetailRead(ApplicationRead):
     """Расширенная схема для детального просмотра заявки"""
     project: ProjectRead  # Проект, на который подал заявку
     applicant: UserRead  # Человек, который подал заявку
+
+
+class ProjectApplicationsPage(BaseModel):
+    """Страница заявок на проект: сам проект один раз + top-k кандидатов"""
+    project: ProjectRead
+    applications: List[ApplicationRead]
+
+
+MAX_BULK_STATUS = 1000
+
+
+class ApplicationBulkStatusUpdate(BaseModel):
+    """
+    Схема для массовой смены статуса pending-заявок.
+    Либо список ID, либо проект + порог: все pending-заявки с совместимостью ниже below_score.
+    """
+    status: Literal["accepted", "rejected"]
+    application_ids: List[int] = Field(default_factory=list, max_length=MAX_BULK_STATUS)
+    project_id: Optional[int] = None
+    below_score: Optional[float] = Field(None, ge=0.0, le=1.0)
+
+    @model_validator(mode="after")
+    def check_target(self):
+        by_ids = bool(self.application_ids)
+        by_score = self.project_id is not None and self.below_score is not None
+        if by_ids == by_score:
+            raise ValueError("Pass either application_ids or project_id + below_score")
+        return self
+
+
+class ApplicationStatusResult(BaseModel):
+    """Итог по одной заявке"""
+    id: int
+    result: Literal["updated", "not_pending", "not_found"]
+
+
+class ApplicationBulkStatusRead(BaseModel):
+    """Результат массовой смены статуса"""
+    status: str
+    updated: int
+    results: List[ApplicationStatusResult]
+
+
+# ============ MATCHING SCHEMAS ============
+MAX_SCORE_BATCH = 500
+
+
+class ScoreBatchRequest(BaseModel):
+    """
+    Схема для пакетного расчёта совместимости.
+    Либо один юзер и список проектов, либо один проект и список юзеров.
+    """
+    user_id: Optional[int] = None
+    project_ids: List[int] = Field(default_factory=list, max_length=MAX_SCORE_BATCH)
+    project_id: Optional[int] = None
+    user_ids: List[int] = Field(default_factory=list, max_length=MAX_SCORE_BATCH)
+    metric: Literal["cosine", "jaccard"] = "cosine"
+
+    @model_validator(mode="after")
+    def check_direction(self):
+        # Поля другого направления должны быть пустыми, иначе непонятно, что считать
+        by_user = self.user_id is not None and bool(self.project_ids)
+        by_project = self.project_id is not None and bool(self.user_ids)
+        user_side = self.user_id is not None or bool(self.project_ids)
+        project_side = self.project_id is not None or bool(self.user_ids)
+        if (user_side and project_side) or not (by_user or by_project):
+            raise ValueError("Pass either user_id + project_ids or project_id + user_ids")
+        return self
+
+
+class ScoreItem(BaseModel):
+    """Оценка совместимости для одного юзера/проекта"""
+    id: int
+    compatibility_score: float = Field(..., ge=0.0, le=1.0)
+
+
+class ScoreBatchRead(BaseModel):
+    """Результат пакетного расчёта совместимости"""
+    metric: str
+    user_id: Optional[int] = None
+    project_id: Optional[int] = None
+    scores: List[ScoreItem] = []
+    missing_ids: List[int] = []  # ID, которых нет в БД
+
+
+# ============ IMPORT SCHEMAS ============
+# Записи NDJSON-импорта: те же схемы создания + поля связей.
+class SkillImport(SkillCreate):
+    """Навык в NDJSON-импорте"""
+    type: Literal["skill"]
+
+
+class UserImport(UserCreate):
+    """Юзер в NDJSON-импорте (сразу с навыками)"""
+    type: Literal["user"]
+    skill_ids: List[int] = Field(default_factory=list)
+    favorite_skill_ids: List[int] = Field(default_factory=list, max_length=3)
+
+
+class ProjectImport(ProjectCreate):
+    """Проект в NDJSON-импорте (владелец по ID или по username)"""
+    type: Literal["project"]
+    owner_id: Optional[int] = None
+    owner_username: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_owner(self):
+        if (self.owner_id is None) == (self.owner_username is None):
+            raise ValueError("Pass either owner_id or owner_username")
+        return self
@@ -0,0 +1,107 @@
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from app.database import read_session_maker
+from app.models import Skill
+from app.schemas import SkillRead
+
+_skills_adapter = TypeAdapter(list[SkillRead])
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """Неизменяемый снимок каталога навыков"""
+    version: int
+    etag: str
+    body: bytes  # готовый JSON для GET /auth/skills
+    by_id: dict[int, Skill]  # detached-объекты, только для чтения
+    loaded_at: float  # time.monotonic() перед SELECT-ом, из которого собран снимок
+
+
+# ============ КЭШ КАТАЛОГА НАВЫКОВ ============
+class SkillCatalog:
+    """
+    In-process кэш каталога навыков.
+
+    Каталог меняется только через create_skill, поэтому держим в памяти
+    готовый снимок: сериализованный JSON, ETag и словарь id → Skill.
+    Любая запись навыка вызывает invalidate(), и снимок перечитывается
+    при следующем обращении. Записи из других воркеров сюда не доходят —
+    их ловит перепроверка промахов в resolve_ids().
+    """
+
+    def __init__(self):
+        self._version = 0
+        self._snapshot: CatalogSnapshot | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def invalidate(self) -> None:
+        """Сбрасывает снимок (зовётся после любой записи в skills)"""
+        self._version += 1
+        self._snapshot = None
+
+    async def snapshot(self) -> CatalogSnapshot:
+        """Возвращает актуальный снимок, при необходимости перечитывая БД"""
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+
+        async with self._lock:
+            if self._snapshot is not None:
+                return self._snapshot
+
+            version = self._version
+            loaded_at = time.monotonic()
+            # Своя сессия: объекты в снимке должны быть detached,
+            # а не привязаны к сессии того запроса, который прогрел кэш
+            async with read_session_maker() as session:
+                stmt = select(Skill).order_by(Skill.category, Skill.name)
+                skills = (await session.execute(stmt)).scalars().all()
+            body = _skills_adapter.dump_json([SkillRead.model_validate(skill) for skill in skills])
+            snapshot = CatalogSnapshot(
+                version=version,
+                # ETag от содержимого — одинаковый во всех воркерах
+                etag=f'"{hashlib.sha1(body).hexdigest()[:20]}"',
+                body=body,
+                by_id={skill.id: skill for skill in skills},
+                loaded_at=loaded_at,
+            )
+            # Если каталог успели поменять, пока шёл SELECT, снимок не сохраняем
+            if version == self._version:
+                self._snapshot = snapshot
+            return snapshot
+
+    async def resolve_ids(self, skill_ids) -> list[int]:
+        """
+        Оставляет только существующие ID навыков (порядок сохраняется,
+        дубли убираются) — без запроса в БД, пока все ID есть в снимке.
+
+        Навык могли создать в другом воркере, и здешний снимок о нём не знает:
+        промахи перепроверяются одним запросом в БД, а если навык нашёлся,
+        снимок сбрасывается. Снимок, прочитанный уже после начала вызова,
+        устареть не мог — по нему промахи не перепроверяются.
+        """
+        started = time.monotonic()
+        skill_ids = list(dict.fromkeys(skill_ids))
+        snapshot = await self.snapshot()
+        by_id = snapshot.by_id
+        missing = [skill_id for skill_id in skill_ids if skill_id not in by_id]
+        found = set()
+        if missing and snapshot.loaded_at < started:
+            async with read_session_maker() as session:
+                stmt = select(Skill.id).where(Skill.id.in_(missing))
+                found = set((await session.execute(stmt)).scalars())
+            if found:
+                self.invalidate()
+        return [skill_id for skill_id in skill_ids if skill_id in by_id or skill_id in found]
+
+
+# Один каталог на процесс
+skill_catalog = SkillCatalog()
@@ -0,0 +1,303 @@
+import asyncio
+import heapq
+import math
+from abc import ABC, abstractmethod
+from collections import Counter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Project, project_skill_association, user_skill_association
+from app.matching import APPROXIMATE_MATCHING, MinHashLSH
+
+
+def skills_to_mask(skill_ids) -> int:
+    """Переводит набор ID навыков в битсет (бит N = навык с id N)"""
+    mask = 0
+    for skill_id in skill_ids:
+        mask |= 1 << skill_id
+    return mask
+
+
+class _SkillIndex(ABC):
+    """
+    Общая часть in-memory индексов: ленивая загрузка из БД и журнал
+    изменений, которые пришли, пока шла перестройка.
+    """
+
+    def __init__(self, lsh: MinHashLSH | None = None):
+        # Опциональный LSH для приближённого поиска (approximate=True)
+        self.lsh = lsh
+        self._loaded = False
+        self._lock = asyncio.Lock()
+        # Изменения, пришедшие во время перестройки индекса
+        self._journal: list[tuple] | None = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    async def ensure_loaded(self, session: AsyncSession) -> None:
+        """Загружает индекс из БД, если он ещё не был загружен"""
+        if not self._loaded:
+            await self.rebuild(session)
+
+    async def rebuild(self, session: AsyncSession) -> None:
+        """Полностью перестраивает индекс по данным из БД"""
+        async with self._lock:
+            self._journal = []
+            try:
+                await self._load(session)
+                # Докатываем то, что успело поменяться, пока шёл SELECT
+                for op, *args in self._journal:
+                    getattr(self, op)(*args)
+                self._loaded = True
+            finally:
+                self._journal = None
+
+    def _record(self, op: str, *args) -> None:
+        if self._journal is not None:
+            self._journal.append((op, *args))
+
+    @abstractmethod
+    async def _load(self, session: AsyncSession) -> None:
+        """Заполняет индекс из БД (зовётся под локом из rebuild)"""
+
+
+# ============ ИНДЕКС ОТКРЫТЫХ ПРОЕКТОВ ============
+class ProjectSkillIndex(_SkillIndex):
+    """
+    Держит в памяти навыки всех открытых проектов в виде битсет-матрицы.
+
+    Каждая строка — битовая маска навыков проекта + заранее посчитанная
+    норма ||B|| = sqrt(кол-во навыков). Косинус с юзером считается одним
+    проходом по всем строкам: popcount(A & B) / (||A|| * ||B||),
+    после чего берём top-k через heapq.
+    """
+
+    def __init__(self, lsh: MinHashLSH | None = None):
+        super().__init__(lsh)
+        self._ids: list[int] = []
+        self._owners: list[int] = []
+        self._masks: list[int] = []
+        self._norms: list[float] = []
+        self._positions: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    async def _load(self, session: AsyncSession) -> None:
+        stmt = (
+            select(Project.id, Project.owner_id, project_skill_association.c.skill_id)
+            .outerjoin(
+                project_skill_association,
+                project_skill_association.c.project_id == Project.id,
+            )
+            .where(Project.status == "open")
+        )
+        result = await session.execute(stmt)
+
+        rows: dict[int, tuple[int, set[int]]] = {}
+        for project_id, owner_id, skill_id in result:
+            _, skill_ids = rows.setdefault(project_id, (owner_id, set()))
+            if skill_id is not None:
+                skill_ids.add(skill_id)
+
+        self._clear()
+        for project_id, (owner_id, skill_ids) in rows.items():
+            self._upsert(project_id, owner_id, skill_ids)
+
+    def upsert(self, project_id: int, owner_id: int, skill_ids) -> None:
+        """Добавляет (или обновляет) открытый проект в индексе"""
+        skill_ids = set(skill_ids)
+        self._record("_upsert", project_id, owner_id, skill_ids)
+        self._upsert(project_id, owner_id, skill_ids)
+
+    def remove(self, project_id: int) -> None:
+        """Убирает проект из индекса (например, когда он больше не open)"""
+        self._record("_remove", project_id)
+        self._remove(project_id)
+
+    def top_k(
+        self,
+        skill_ids,
+        k: int,
+        exclude_owner_id: int | None = None,
+        approximate: bool = False,
+    ) -> list[tuple[int, float]]:
+        """
+        Возвращает до k пар (project_id, score) с наибольшей совместимостью.
+        Проекты без общих навыков в выдачу не попадают.
+
+        approximate=True считает точный косинус только по шорт-листу из LSH
+        (если LSH не включён — обычный полный проход).
+        """
+        user_mask = skills_to_mask(skill_ids)
+        if not user_mask or k <= 0:
+            return []
+        user_norm = math.sqrt(user_mask.bit_count())
+
+        if approximate and self.lsh is not None:
+            positions = [
+                self._positions[project_id]
+                for project_id in self.lsh.query(skill_ids)
+                if project_id in self._positions
+            ]
+            rows = (
+                (self._ids[pos], self._owners[pos], self._masks[pos], self._norms[pos])
+                for pos in positions
+            )
+        else:
+            rows = zip(self._ids, self._owners, self._masks, self._norms)
+
+        scores = (
+            ((mask & user_mask).bit_count() / norm, project_id)
+            for project_id, owner_id, mask, norm in rows
+            if owner_id != exclude_owner_id and mask & user_mask
+        )
+        best = heapq.nlargest(k, scores)
+        return [(project_id, round(score / user_norm, 2)) for score, project_id in best]
+
+    def _clear(self) -> None:
+        self._ids.clear()
+        self._owners.clear()
+        self._masks.clear()
+        self._norms.clear()
+        self._positions.clear()
+        if self.lsh is not None:
+            self.lsh.clear()
+
+    def _upsert(self, project_id: int, owner_id: int, skill_ids) -> None:
+        if self.lsh is not None:
+            self.lsh.add(project_id, skill_ids)
+        mask = skills_to_mask(skill_ids)
+        norm = math.sqrt(mask.bit_count())
+        pos = self._positions.get(project_id)
+        if pos is None:
+            self._positions[project_id] = len(self._ids)
+            self._ids.append(project_id)
+            self._owners.append(owner_id)
+            self._masks.append(mask)
+            self._norms.append(norm)
+        else:
+            self._owners[pos] = owner_id
+            self._masks[pos] = mask
+            self._norms[pos] = norm
+
+    def _remove(self, project_id: int) -> None:
+        if self.lsh is not None:
+            self.lsh.remove(project_id)
+        pos = self._positions.pop(project_id, None)
+        if pos is None:
+            return
+        # swap-remove: переносим последнюю строку на место удалённой
+        last = len(self._ids) - 1
+        if pos != last:
+            for column in (self._ids, self._owners, self._masks, self._norms):
+                column[pos] = column[last]
+            self._positions[self._ids[pos]] = pos
+        for column in (self._ids, self._owners, self._masks, self._norms):
+            column.pop()
+
+
+# ============ ОБРАТНЫЙ ИНДЕКС НАВЫК → ЮЗЕРЫ ============
+class UserSkillIndex(_SkillIndex):
+    """
+    Инвертированный индекс skill_id -> {user_id} + кэш кол-ва навыков юзера.
+
+    Кандидатами на проект становятся только юзеры, у которых есть хотя бы
+    один навык проекта. Пересечение считается по спискам навыков проекта,
+    а нормы ||A|| берутся из закэшированных счётчиков.
+    """
+
+    def __init__(self, lsh: MinHashLSH | None = None):
+        super().__init__(lsh)
+        self._postings: dict[int, set[int]] = {}
+        self._skills: dict[int, frozenset[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._skills)
+
+    async def _load(self, session: AsyncSession) -> None:
+        stmt = select(
+            user_skill_association.c.user_id,
+            user_skill_association.c.skill_id,
+        )
+        result = await session.execute(stmt)
+
+        rows: dict[int, set[int]] = {}
+        for user_id, skill_id in result:
+            rows.setdefault(user_id, set()).add(skill_id)
+
+        self._postings.clear()
+        self._skills.clear()
+        if self.lsh is not None:
+            self.lsh.clear()
+        for user_id, skill_ids in rows.items():
+            self._set_skills(user_id, frozenset(skill_ids))
+
+    def set_skills(self, user_id: int, skill_ids) -> None:
+        """Запоминает актуальный набор навыков юзера"""
+        skill_ids = frozenset(skill_ids)
+        self._record("_set_skills", user_id, skill_ids)
+        self._set_skills(user_id, skill_ids)
+
+    def top_k(
+        self,
+        skill_ids,
+        k: int,
+        exclude_user_id: int | None = None,
+        approximate: bool = False,
+    ) -> list[tuple[int, float]]:
+        """
+        Возвращает до k пар (user_id, score) с наибольшей совместимостью.
+        Формула та же, что в calculate_compatibility.
+
+        approximate=True берёт кандидатов из LSH вместо обратного индекса.
+        """
+        skill_ids = set(skill_ids)
+        if not skill_ids or k <= 0:
+            return []
+
+        if approximate and self.lsh is not None:
+            intersections = {
+                user_id: len(skill_ids & self._skills[user_id])
+                for user_id in self.lsh.query(skill_ids)
+                if user_id in self._skills
+            }
+            intersections = {user_id: n for user_id, n in intersections.items() if n}
+        else:
+            intersections = Counter()
+            for skill_id in skill_ids:
+                intersections.update(self._postings.get(skill_id, ()))
+        intersections.pop(exclude_user_id, None)
+
+        project_norm = math.sqrt(len(skill_ids))
+        scores = (
+            (intersection / math.sqrt(len(self._skills[user_id])), user_id)
+            for user_id, intersection in intersections.items()
+        )
+        best = heapq.nlargest(k, scores)
+        return [(user_id, round(score / project_norm, 2)) for score, user_id in best]
+
+    def _set_skills(self, user_id: int, skill_ids: frozenset[int]) -> None:
+        old_skill_ids = self._skills.get(user_id, frozenset())
+        for skill_id in old_skill_ids - skill_ids:
+            users = self._postings.get(skill_id)
+            if users is not None:
+                users.discard(user_id)
+                if not users:
+                    del self._postings[skill_id]
+        for skill_id in skill_ids - old_skill_ids:
+            self._postings.setdefault(skill_id, set()).add(user_id)
+        # Юзеров без навыков не храним: кандидатами они не бывают, а len() —
+        # это «юзеры с навыками» в логе запуска
+        if skill_ids:
+            self._skills[user_id] = skill_ids
+        else:
+            self._skills.pop(user_id, None)
+        if self.lsh is not None:
+            self.lsh.add(user_id, skill_ids)
+
+
+# Один индекс каждого вида на процесс
+project_index = ProjectSkillIndex(lsh=MinHashLSH() if APPROXIMATE_MATCHING else None)
+user_index = UserSkillIndex(lsh=MinHashLSH() if APPROXIMATE_MATCHING else None)
@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterable, AsyncIterator
+from datetime import datetime
+from starlette.responses import StreamingResponse
+
+# Сколько байт копить перед отправкой чанка клиенту
+CHUNK_BYTES = 64 * 1024
+
+
+# ============ NDJSON ПОТОКИ ============
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """Режет поток байтов на строки; в памяти только хвост последнего чанка"""
+    tail = b""
+    async for chunk in chunks:
+        tail += chunk
+        *lines, tail = tail.split(b"\n")
+        for line in lines:
+            yield line
+    if tail:
+        yield tail
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+async def ndjson_stream(rows: AsyncIterable[dict]) -> AsyncIterator[bytes]:
+    """Кодирует строки в NDJSON и отдаёт их чанками по ~CHUNK_BYTES"""
+    buffer = io.StringIO()
+    async for row in rows:
+        buffer.write(json.dumps(row, ensure_ascii=False, default=_json_default))
+        buffer.write("\n")
+        if buffer.tell() >= CHUNK_BYTES:
+            yield buffer.getvalue().encode()
+            buffer = io.StringIO()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+# ============ CSV ПОТОКИ ============
+def _csv_cell(value):
+    """Списки (ID навыков) — через ';', даты — в ISO"""
+    if isinstance(value, (list, tuple)):
+        return ";".join(str(item) for item in value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+async def csv_stream(rows: AsyncIterable[dict], columns: list[str]) -> AsyncIterator[bytes]:
+    """Кодирует строки в CSV с заголовком и отдаёт их чанками по ~CHUNK_BYTES"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    async for row in rows:
+        writer.writerow([_csv_cell(row[column]) for column in columns])
+        if buffer.tell() >= CHUNK_BYTES:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+# ============ ОТВЕТ ПО МЕРЕ ЧТЕНИЯ ТЕЛА ============
+class BodyStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse для ответа, который пишется по мере чтения тела запроса.
+
+    Обычный StreamingResponse параллельно слушает receive() в ожидании
+    disconnect и забирал бы себе чанки тела. Здесь receive() читает только
+    генератор, а обрыв соединения он увидит сам (ClientDisconnect из request.stream()).
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,98 @@
+import asyncio
+from datetime import datetime
+from app.config import settings
+from app.database import async_session_maker, count_queries, charge_queries, run_detached
+from app.crud import insert_pending_applications
+from app.metrics import Histogram
+
+BATCH_SIZE_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+APPLICATION_BATCH_SIZE = Histogram(
+    "application_batch_size", "Applications written per group commit", buckets=BATCH_SIZE_BUCKETS,
+)
+
+
+# ============ GROUP COMMIT ЗАЯВОК ============
+class ApplicationBatcher:
+    """
+    Копит уже провалидированные заявки из параллельных запросов и пишет их
+    одним многострочным INSERT и одним коммитом: SQLite сериализует коммиты,
+    так что под наплывом заявок выгоднее один коммит на пачку, чем на заявку.
+
+    Пачка уходит через `window` секунд после первой заявки (или сразу,
+    если набралось max_batch). Каждый submit() получает свой результат:
+    (id, created_at) или ValueError, если pending-заявка уже есть —
+    тот же контракт, что у crud.insert_pending_application.
+
+    Как и у лоадеров, пачка пишется в чистом контексте, а её запросы
+    записываются на каждый запрос, чья заявка в неё попала.
+    """
+
+    def __init__(
+        self,
+        window: float = settings.application_batch_window_ms / 1000,
+        max_batch: int = settings.application_batch_max,
+    ):
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: dict[tuple[int, int], tuple[float, asyncio.Future]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, project_id: int, applicant_id: int, compatibility_score: float) -> tuple[int, datetime]:
+        """Ставит заявку в пачку и ждёт её коммита"""
+        key = (project_id, applicant_id)
+        if key in self._pending:
+            # Та же пара уже ждёт в пачке: вставится максимум одна из них
+            raise ValueError("Application already exists")
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending[key] = (compatibility_score, future)
+        if len(self._pending) >= self.max_batch:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._dispatch)
+        # shield: отмена запроса не отменяет запись остальной пачки
+        outcome, spent = await asyncio.shield(future)
+        charge_queries(spent)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    async def drain(self) -> None:
+        """Отправляет то, что накопилось, и ждёт все незавершённые пачки (при остановке)"""
+        self._dispatch()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            # Чистый контекст: пачка не принадлежит запросу, который её открыл
+            task = run_detached(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict[tuple[int, int], tuple[float, asyncio.Future]]) -> None:
+        APPLICATION_BATCH_SIZE.observe(len(batch))
+        rows = [(project_id, applicant_id, score) for (project_id, applicant_id), (score, _) in batch.items()]
+        with count_queries(deferred=True) as spent:
+            try:
+                async with async_session_maker() as session:
+                    inserted = await insert_pending_applications(session, rows)
+            except Exception as e:
+                outcomes = dict.fromkeys(batch, e)
+            else:
+                outcomes = {key: inserted.get(key) or ValueError("Application already exists") for key in batch}
+        # Дубликат и ошибка — тоже результат: запросы пачки записываются и на них
+        for key, (_, future) in batch.items():
+            if not future.done():
+                future.set_result((outcomes[key], spent))
+
+
+# Один на процесс; включается APPLICATION_BATCHING
+application_batcher = ApplicationBatcher()
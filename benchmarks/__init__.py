@@ -0,0 +1,10 @@
+"""
+Бенчмарки Project Matching API.
+
+    python -m benchmarks seed  --users 1000 --projects 2000 --skills 200
+    python -m benchmarks micro
+    python -m benchmarks load  --requests 500 --concurrency 20
+    python -m benchmarks all   --output results.json
+
+Результаты — JSON, чтобы прогоны можно было сравнивать между собой.
+"""
@@ -0,0 +1,60 @@
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import sys
+from datetime import datetime, timezone
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("command", choices=["seed", "micro", "load", "all"])
+    parser.add_argument("--database", default="sqlite+aiosqlite:///./benchmark.db",
+                        help="URL БД для seed/load (по умолчанию отдельный benchmark.db)")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--projects", type=int, default=2000)
+    parser.add_argument("--skills", type=int, default=200)
+    parser.add_argument("--pairs", type=int, default=2000, help="Пар юзер/проект для micro")
+    parser.add_argument("--requests", type=int, default=500, help="Запросов на сценарий для load")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Куда записать JSON (по умолчанию stdout)")
+    args = parser.parse_args(argv)
+
+    # URL БД читается при импорте app.database — выставляем его до импорта приложения
+    os.environ["DATABASE_URL"] = args.database
+    from benchmarks.data import seed_database
+    from benchmarks.micro import run_micro
+    from benchmarks.load import run_load
+
+    report = {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "args": vars(args),
+    }
+    # Принты приложения (init_db, startup) не должны попадать в JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        if args.command in ("seed", "all"):
+            report["seed"] = asyncio.run(
+                seed_database(args.users, args.projects, args.skills, args.seed)
+            )
+        if args.command in ("micro", "all"):
+            report["micro"] = run_micro(pairs=args.pairs, skills=args.skills, seed=args.seed)
+        if args.command in ("load", "all"):
+            report["load"] = asyncio.run(
+                run_load(requests=args.requests, concurrency=args.concurrency, seed=args.seed)
+            )
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
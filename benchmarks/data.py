@@ -0,0 +1,115 @@
+import random
+from sqlalchemy import insert
+from app.database import Base, engine, async_session_maker, init_db
+from app.models import User, Skill, Project, user_skill_association, project_skill_association
+
+CATEGORIES = ["backend", "frontend", "devops", "design", "data", "mobile"]
+# Доли статусов проектов в сгенерированных данных
+PROJECT_STATUSES = {"open": 0.7, "in_progress": 0.2, "closed": 0.1}
+
+
+# ============ СИНТЕТИЧЕСКИЕ ДАННЫЕ ============
+def skill_sets(
+    rng: random.Random,
+    count: int,
+    skill_ids: list[int],
+    low: int,
+    high: int,
+) -> list[list[int]]:
+    """
+    Наборы навыков, похожие на реальные: популярность навыка ~ 1/rank,
+    размер набора — логнормальный (чаще 2–5 навыков, редко до `high`).
+    """
+    weights = [1 / rank for rank in range(1, len(skill_ids) + 1)]
+    sets = []
+    for _ in range(count):
+        size = min(high, len(skill_ids), max(low, round(rng.lognormvariate(1.3, 0.5))))
+        chosen: set[int] = set()
+        while len(chosen) < size:
+            chosen.update(rng.choices(skill_ids, weights, k=size - len(chosen)))
+        sets.append(sorted(chosen))
+    return sets
+
+
+async def seed_database(
+    users: int = 1000,
+    projects: int = 2000,
+    skills: int = 200,
+    seed: int = 0,
+) -> dict:
+    """Пересоздаёт схему и заполняет БД синтетическими данными через модели приложения"""
+    rng = random.Random(seed)
+
+    # projects_fts не в metadata: без явного DROP старый индекс пережил бы пересоздание
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("DROP TABLE IF EXISTS projects_fts")
+        await conn.run_sync(Base.metadata.drop_all)
+    # Схема, FTS-таблица и триггеры — как при старте приложения
+    await init_db()
+
+    async with async_session_maker() as session:
+        skill_rows = [
+            Skill(name=f"skill-{i:04d}", category=rng.choice(CATEGORIES))
+            for i in range(skills)
+        ]
+        session.add_all(skill_rows)
+        await session.flush()
+        skill_ids = [skill.id for skill in skill_rows]
+
+        user_skills = skill_sets(rng, users, skill_ids, low=1, high=20)
+        user_rows = [
+            User(
+                username=f"user{i:06d}",
+                email=f"user{i:06d}@example.com",
+                full_name=f"User {i}",
+                skill_count=len(user_skills[i]),
+            )
+            for i in range(users)
+        ]
+        session.add_all(user_rows)
+        await session.flush()
+
+        rows = []
+        for user, ids in zip(user_rows, user_skills):
+            favorites = set(rng.sample(ids, min(3, len(ids))))
+            rows.extend(
+                {"user_id": user.id, "skill_id": skill_id, "is_favorite": skill_id in favorites}
+                for skill_id in ids
+            )
+        if rows:
+            await session.execute(insert(user_skill_association), rows)
+
+        project_skills = skill_sets(rng, projects, skill_ids, low=1, high=10)
+        statuses = rng.choices(list(PROJECT_STATUSES), list(PROJECT_STATUSES.values()), k=projects)
+        project_rows = [
+            Project(
+                title=f"Project {i}",
+                description=f"Synthetic benchmark project #{i}",
+                status=statuses[i],
+                owner_id=rng.choice(user_rows).id,
+                skill_count=len(project_skills[i]),
+            )
+            for i in range(projects)
+        ]
+        session.add_all(project_rows)
+        await session.flush()
+
+        rows = [
+            {"project_id": project.id, "skill_id": skill_id}
+            for project, ids in zip(project_rows, project_skills)
+            for skill_id in ids
+        ]
+        if rows:
+            await session.execute(insert(project_skill_association), rows)
+
+        await session.commit()
+
+    return {
+        "users": users,
+        "projects": projects,
+        "skills": skills,
+        "seed": seed,
+        "avg_user_skills": round(sum(map(len, user_skills)) / max(users, 1), 2),
+        "avg_project_skills": round(sum(map(len, project_skills)) / max(projects, 1), 2),
+        "open_projects": statuses.count("open"),
+    }
@@ -0,0 +1,167 @@
+import asyncio
+import math
+import random
+import time
+import uuid
+from sqlalchemy import select, event
+from app.database import async_session_maker, count_queries, engines
+from app.models import User, Project
+from app.response_cache import feed_cache
+
+
+# ============ НАГРУЗКА НА ЭНДПОИНТЫ ============
+# Приложение крутится в этом же процессе через ASGI-транспорт httpx:
+# без сети и uvicorn, так что в замер попадает только код приложения и БД.
+# queries_per_request — тем же счётчиком, что и query_budget: общие пачки
+# лоадеров записываются на каждый запрос целиком. db_queries_per_request —
+# сколько запросов реально ушло в БД за прогон, делённое на число запросов.
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    """Перцентиль методом nearest-rank"""
+    rank = max(0, math.ceil(percent / 100 * len(sorted_values)) - 1)
+    return sorted_values[rank]
+
+
+def _summary(latencies: list[float], queries: list[int], db_queries: int, errors: int, wall: float) -> dict:
+    latencies = sorted(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / wall, 1) if wall else None,
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3),
+        "queries_per_request": round(sum(queries) / len(queries), 2),
+        "db_queries_per_request": round(db_queries / len(queries), 2),
+        "max_queries": max(queries),
+    }
+
+
+async def _measure(client, scenario, requests: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    queries: list[int] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        nonlocal errors
+        async with semaphore:
+            with count_queries() as counter:
+                started = time.perf_counter()
+                response = await scenario(client, i)
+                latencies.append(time.perf_counter() - started)
+            queries.append(counter.count)
+            if response.status_code >= 400:
+                errors += 1
+
+    db_queries = 0
+
+    def count_db_query(*args):
+        nonlocal db_queries
+        db_queries += 1
+
+    for engine in engines:
+        event.listen(engine.sync_engine, "before_cursor_execute", count_db_query)
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*(one(i) for i in range(requests)))
+    finally:
+        wall = time.perf_counter() - started
+        for engine in engines:
+            event.remove(engine.sync_engine, "before_cursor_execute", count_db_query)
+    return _summary(latencies, queries, db_queries, errors, wall)
+
+
+async def _load_ids() -> tuple[list[int], list[tuple[int, int]]]:
+    """ID юзеров и пары (project_id, owner_id) открытых проектов"""
+    async with async_session_maker() as session:
+        user_ids = list((await session.execute(select(User.id))).scalars())
+        projects = [
+            tuple(row)
+            for row in await session.execute(
+                select(Project.id, Project.owner_id).where(Project.status == "open")
+            )
+        ]
+    return user_ids, projects
+
+
+def _scenarios(user_ids: list[int], projects: list[tuple[int, int]], requests: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    run = uuid.uuid4().hex[:8]
+    project_ids = [project_id for project_id, _ in projects]
+
+    # Уникальные пары (проект, кандидат), кандидат — не владелец
+    applications: list[tuple[int, int]] = []
+    seen: set[tuple[int, int]] = set()
+    attempts = 0
+    while len(applications) < requests and attempts < requests * 20 and len(user_ids) > 1 and projects:
+        attempts += 1
+        project_id, owner_id = rng.choice(projects)
+        applicant_id = rng.choice(user_ids)
+        if applicant_id != owner_id and (project_id, applicant_id) not in seen:
+            seen.add((project_id, applicant_id))
+            applications.append((project_id, applicant_id))
+
+    async def register(client, i):
+        return await client.post("/auth/register", json={
+            "username": f"bench-{run}-{i}",
+            "email": f"bench-{run}-{i}@example.com",
+            "full_name": "Bench User",
+        })
+
+    async def list_projects(client, i):
+        return await client.get("/projects/", params={"limit": 20})
+
+    async def list_projects_uncached(client, i):
+        # Та же страница мимо кэша ленты: иначе после прогрева меряется только кэш
+        feed_cache.invalidate()
+        return await client.get("/projects/", params={"limit": 20})
+
+    async def project_detail(client, i):
+        return await client.get(f"/projects/{rng.choice(project_ids)}")
+
+    async def submit_application(client, i):
+        project_id, applicant_id = applications[i % len(applications)]
+        return await client.post(
+            "/applications/",
+            params={"applicant_id": applicant_id},
+            json={"project_id": project_id},
+        )
+
+    scenarios = {
+        "register": register,
+        "list_projects": list_projects,
+        "list_projects_uncached": list_projects_uncached,
+    }
+    if project_ids:
+        scenarios["project_detail"] = project_detail
+    if applications:
+        scenarios["submit_application"] = submit_application
+    return scenarios
+
+
+async def run_load(requests: int = 500, concurrency: int = 10, warmup: int = 10, seed: int = 0) -> dict:
+    """
+    Гоняет сценарии register / list projects / project detail / submit application
+    и возвращает p50/p95/p99 латентности и кол-во SQL-запросов на запрос.
+    """
+    # httpx нужен только бенчмаркам (и тестовому клиенту), поэтому импорт ленивый
+    from httpx import AsyncClient, ASGITransport
+    from app.main import app
+
+    await app.router.startup()
+    try:
+        user_ids, projects = await _load_ids()
+        scenarios = _scenarios(user_ids, projects, requests + warmup, seed)
+        results = {}
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+            for name, scenario in scenarios.items():
+                # Прогрев: холодные кэши и индексы не должны портить перцентили
+                for i in range(warmup):
+                    await scenario(client, requests + i)
+                results[name] = await _measure(client, scenario, requests, concurrency)
+    finally:
+        await app.router.shutdown()
+
+    return {"requests": requests, "concurrency": concurrency, "warmup": warmup, "results": results}
@@ -0,0 +1,79 @@
+import asyncio
+import random
+import statistics
+import time
+from app.matching import (
+    calculate_compatibility,
+    calculate_compatibility_jaccard,
+    cosine_similarity,
+    jaccard_similarity,
+)
+from app.models import User, Project, Skill
+from benchmarks.data import skill_sets
+
+
+# ============ МИКРОБЕНЧМАРКИ СКОРИНГА ============
+def _pairs(count: int, skills: int, seed: int) -> list[tuple[User, Project]]:
+    """Transient-объекты User/Project с навыками (без сессии и БД)"""
+    rng = random.Random(seed)
+    skill_rows = [Skill(id=i, name=f"skill-{i}") for i in range(1, skills + 1)]
+    skill_ids = [skill.id for skill in skill_rows]
+    user_sets = skill_sets(rng, count, skill_ids, low=1, high=20)
+    project_sets = skill_sets(rng, count, skill_ids, low=1, high=10)
+    return [
+        (
+            User(skills=[skill_rows[i - 1] for i in user_ids]),
+            Project(skills=[skill_rows[i - 1] for i in project_ids]),
+        )
+        for user_ids, project_ids in zip(user_sets, project_sets)
+    ]
+
+
+def _summary(per_call_seconds: list[float]) -> dict:
+    return {
+        "best_us": round(min(per_call_seconds) * 1e6, 3),
+        "median_us": round(statistics.median(per_call_seconds) * 1e6, 3),
+    }
+
+
+async def _time_async(scorer, pairs, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for user, project in pairs:
+            await scorer(None, user, project)
+        timings.append((time.perf_counter() - started) / len(pairs))
+    return _summary(timings)
+
+
+def _time_sync(scorer, sets, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for user_skill_ids, project_skill_ids in sets:
+            scorer(user_skill_ids, project_skill_ids)
+        timings.append((time.perf_counter() - started) / len(sets))
+    return _summary(timings)
+
+
+def run_micro(pairs: int = 2000, skills: int = 200, repeat: int = 7, seed: int = 0) -> dict:
+    """
+    Время одного вызова (мкс, лучший и медианный из `repeat` прогонов):
+    ORM-обёртки calculate_compatibility* и чистое ядро на ID навыков.
+    """
+    orm_pairs = _pairs(pairs, skills, seed)
+    id_sets = [
+        (frozenset(skill.id for skill in user.skills), [skill.id for skill in project.skills])
+        for user, project in orm_pairs
+    ]
+
+    async def run_async() -> dict:
+        return {
+            "calculate_compatibility": await _time_async(calculate_compatibility, orm_pairs, repeat),
+            "calculate_compatibility_jaccard": await _time_async(calculate_compatibility_jaccard, orm_pairs, repeat),
+        }
+
+    results = asyncio.run(run_async())
+    results["cosine_similarity"] = _time_sync(cosine_similarity, id_sets, repeat)
+    results["jaccard_similarity"] = _time_sync(jaccard_similarity, id_sets, repeat)
+    return {"pairs": pairs, "skills": skills, "repeat": repeat, "results": results}
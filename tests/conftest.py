@@ -0,0 +1,92 @@
+import os
+import tempfile
+
+# Настройки читаются при импорте app, поэтому окружение — до него.
+# Своя временная БД на прогон
+_tmp_dir = tempfile.mkdtemp(prefix="matching-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_tmp_dir}/test.db"
+os.environ["PROFILING_ENABLED"] = "0"
+os.environ["APPLICATION_BATCHING"] = "0"
+
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import count_queries
+from app.main import app
+
+
+class QueryRecorder:
+    """
+    ASGI-обёртка: считает SQL-запросы каждого HTTP-запроса целиком,
+    включая выход из yield-dependencies (в FastAPI 0.104 он после ответа).
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.route = None
+        self.count = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with count_queries() as counter:
+            await self.app(scope, receive, send)
+        # Router кладёт найденный роут в тот же scope
+        self.route = scope.get("route")
+        self.count = counter.count
+
+
+@pytest.fixture(scope="session")
+def recorder():
+    return QueryRecorder(app)
+
+
+@pytest.fixture(scope="session")
+def client(recorder):
+    # Один клиент (и один event loop) на весь прогон: фоновые очереди
+    # приложения привязываются к loop при старте
+    with TestClient(recorder) as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def seeded(client):
+    """
+    Базовые данные: 4 навыка, 12 юзеров (owner — первый), 2 проекта владельца
+    и pending-заявки юзеров 2..8 на первый проект.
+    """
+    records = [{"type": "skill", "name": f"skill-{i}"} for i in range(4)]
+    records += [
+        {
+            "type": "user",
+            "username": f"user{i}",
+            "email": f"user{i}@example.com",
+            "full_name": f"User {i}",
+            "skill_ids": [1 + i % 4, 1 + (i + 1) % 4],
+        }
+        for i in range(12)
+    ]
+    records += [
+        {
+            "type": "project",
+            "owner_id": 1,
+            "title": f"Python service {i}",
+            "description": "Backend service with a REST API and background jobs",
+            "skill_ids": [1, 2 + i],
+        }
+        for i in range(2)
+    ]
+    response = client.post("/import/ndjson", content="\n".join(json.dumps(record) for record in records))
+    assert response.status_code == 200
+    assert json.loads(response.text.splitlines()[-1])["errors"] == 0
+
+    application_ids = []
+    for applicant_id in range(2, 9):
+        response = client.post(f"/applications/?applicant_id={applicant_id}", json={"project_id": 1})
+        assert response.status_code == 201
+        application_ids.append(response.json()["id"])
+
+    return {"owner_id": 1, "project_id": 1, "other_project_id": 2, "application_ids": application_ids}
@@ -0,0 +1,117 @@
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.config import settings
+from app.write_batching import APPLICATION_BATCH_SIZE, application_batcher
+
+_names = (f"applicant{i}" for i in itertools.count())
+
+
+def _new_users(client, count):
+    ids = []
+    for _ in range(count):
+        name = next(_names)
+        response = client.post("/auth/register", json={"username": name, "email": f"{name}@example.com", "full_name": name})
+        assert response.status_code == 201
+        ids.append(response.json()["id"])
+    return ids
+
+
+def _new_project(client, owner_id):
+    response = client.post(
+        f"/projects/?owner_id={owner_id}",
+        json={"title": "Applications target", "description": "Receives many applications", "skill_ids": [1, 2]},
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def _apply(client, project_id, applicant_id):
+    return client.post(f"/applications/?applicant_id={applicant_id}", json={"project_id": project_id})
+
+
+@pytest.fixture
+def group_commit(monkeypatch):
+    # Окно побольше: все параллельные заявки теста попадают в одну пачку
+    monkeypatch.setattr(settings, "application_batching", True)
+    monkeypatch.setattr(application_batcher, "window", 0.3)
+
+
+def _batch_count():
+    return sum(count for _, _, count in APPLICATION_BATCH_SIZE._values.values())
+
+
+def test_group_commit_writes_concurrent_applications_in_one_batch(client, seeded, group_commit):
+    project_id = _new_project(client, seeded["owner_id"])
+    applicants = _new_users(client, 6)
+    # Последний подаёт заявку дважды в ту же пачку
+    submissions = applicants + applicants[-1:]
+    batches = _batch_count()
+
+    with ThreadPoolExecutor(len(submissions)) as pool:
+        responses = list(pool.map(lambda applicant_id: _apply(client, project_id, applicant_id), submissions))
+
+    assert _batch_count() == batches + 1
+    assert sorted(response.status_code for response in responses) == [201] * 6 + [400]
+    created = [response.json() for response in responses if response.status_code == 201]
+    assert sorted(item["applicant"]["id"] for item in created) == applicants
+    assert len({item["id"] for item in created}) == 6
+
+    listed = client.get(f"/applications/project/{project_id}").json()
+    assert sorted(item["id"] for item in listed) == sorted(item["id"] for item in created)
+
+
+def test_group_commit_rejects_an_application_that_already_exists(client, seeded, group_commit):
+    project_id = _new_project(client, seeded["owner_id"])
+    (applicant_id,) = _new_users(client, 1)
+
+    assert _apply(client, project_id, applicant_id).status_code == 201
+    response = _apply(client, project_id, applicant_id)
+    assert response.status_code == 400
+
+
+def test_bulk_status_reports_every_id(client, seeded):
+    project_id = _new_project(client, seeded["owner_id"])
+    pending, accepted = (_apply(client, project_id, user_id).json()["id"] for user_id in _new_users(client, 2))
+    assert client.patch(f"/applications/{accepted}/accept").status_code == 200
+
+    response = client.patch(
+        "/applications/bulk-status",
+        json={"status": "rejected", "application_ids": [pending, accepted, 999999]},
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["updated"] == 1
+    assert {item["id"]: item["result"] for item in body["results"]} == {
+        pending: "updated",
+        accepted: "not_pending",
+        999999: "not_found",
+    }
+    assert client.get(f"/applications/{pending}").json()["status"] == "rejected"
+    assert client.get(f"/applications/{accepted}").json()["status"] == "accepted"
+
+
+def test_bulk_status_by_score_threshold(client, seeded):
+    project_id = _new_project(client, seeded["owner_id"])
+    weak, strong = _new_users(client, 2)
+    assert client.put(f"/auth/profile/{strong}/skills", json={"skill_ids": [1, 2]}).status_code == 200
+    weak_id = _apply(client, project_id, weak).json()["id"]
+    strong_id = _apply(client, project_id, strong).json()["id"]
+
+    response = client.patch(
+        "/applications/bulk-status",
+        json={"status": "rejected", "project_id": project_id, "below_score": 0.5},
+    )
+    assert response.status_code == 200
+    assert [(item["id"], item["result"]) for item in response.json()["results"]] == [(weak_id, "updated")]
+    assert client.get(f"/applications/{strong_id}").json()["status"] == "pending"
+
+
+def test_bulk_status_needs_exactly_one_target(client, seeded):
+    response = client.patch(
+        "/applications/bulk-status",
+        json={"status": "rejected", "application_ids": [1], "project_id": 1, "below_score": 0.5},
+    )
+    assert response.status_code == 422
@@ -0,0 +1,50 @@
+import pytest
+
+
+@pytest.fixture
+def project_id(client, seeded):
+    response = client.post(
+        f"/projects/?owner_id={seeded['owner_id']}",
+        json={"title": "Cached project", "description": "Conditional GET target", "skill_ids": [1]},
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def test_unconditional_get_loads_project_without_extra_lookup(client, recorder, project_id):
+    response = client.get(f"/projects/{project_id}")
+    assert response.status_code == 200
+    assert response.headers["ETag"] and response.headers["Last-Modified"]
+    # Проект с владельцем (JOIN) + навыки проекта + навыки владельца, без отдельного updated_at
+    assert recorder.count == 3
+
+
+def test_matching_etag_gets_304_from_one_query(client, recorder, project_id):
+    etag = client.get(f"/projects/{project_id}").headers["ETag"]
+
+    response = client.get(f"/projects/{project_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    assert recorder.count == 1
+
+
+def test_if_modified_since(client, project_id):
+    last_modified = client.get(f"/projects/{project_id}").headers["Last-Modified"]
+
+    assert client.get(f"/projects/{project_id}", headers={"If-Modified-Since": last_modified}).status_code == 304
+    stale = "Mon, 01 Jan 2001 00:00:00 GMT"
+    assert client.get(f"/projects/{project_id}", headers={"If-Modified-Since": stale}).status_code == 200
+
+
+def test_change_invalidates_etag(client, project_id):
+    etag = client.get(f"/projects/{project_id}").headers["ETag"]
+    assert client.patch(f"/projects/{project_id}/status", json={"status": "in_progress"}).status_code == 200
+
+    response = client.get(f"/projects/{project_id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["status"] == "in_progress"
+
+
+def test_conditional_get_of_missing_project_is_404(client):
+    assert client.get("/projects/999999", headers={"If-None-Match": '"project-999999-0"'}).status_code == 404
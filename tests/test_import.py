@@ -0,0 +1,66 @@
+import itertools
+import json
+
+from app.skill_catalog import skill_catalog
+
+_batches = itertools.count()
+
+
+def _import(client, records):
+    response = client.post("/import/ndjson", content="\n".join(json.dumps(record) for record in records))
+    assert response.status_code == 200
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_batch_costs_the_same_number_of_queries_for_any_number_of_records(client, recorder, seeded):
+    def import_batch(size):
+        n = next(_batches)
+        records = [{"type": "skill", "name": f"import-skill-{n}", "category": "backend"}]
+        records += [
+            {
+                "type": "user",
+                "username": f"importer{n}x{i}",
+                "email": f"importer{n}x{i}@example.com",
+                "full_name": "Importer",
+                # Навык из этой же пачки (ID ещё неизвестен каталогу) и существующий
+                "skill_ids": [1, 4 + 1 + n],
+            }
+            for i in range(size)
+        ]
+        records += [
+            {"type": "project", "owner_id": 1, "title": f"Imported project {i}", "description": "Imported in bulk", "skill_ids": [2]}
+            for i in range(size)
+        ]
+        skill_catalog.invalidate()  # каждая пачка — с холодным каталогом
+        reports = _import(client, records)
+        assert reports[-1]["errors"] == 0, reports
+        return recorder.count
+
+    assert import_batch(2) == import_batch(50)
+
+
+def test_errors_are_reported_per_line_and_do_not_stop_the_import(client, seeded):
+    n = next(_batches)
+    user = {"type": "user", "username": f"reporter{n}", "email": f"reporter{n}@example.com", "full_name": "R"}
+    project = {"type": "project", "title": "Reported project", "description": "Imported with errors", "skill_ids": [1]}
+    lines = [
+        json.dumps(user),
+        "{not json",
+        json.dumps({"type": "planet", "name": "Mars"}),
+        "",
+        json.dumps({**user, "email": f"other{n}@example.com"}),
+        json.dumps({**project, "owner_id": 999999}),
+        # Владелец создан строкой выше в этой же пачке
+        json.dumps({**project, "owner_username": f"reporter{n}"}),
+    ]
+    response = client.post("/import/ndjson", content="\n".join(lines))
+    assert response.status_code == 200
+    reports = [json.loads(line) for line in response.text.splitlines()]
+
+    errors = {report["line"]: report["error"] for report in reports if report.get("status") == "error"}
+    assert set(errors) == {2, 3, 5, 6}
+    assert errors[5] == "Username already registered"
+    assert errors[6] == "Owner not found"
+    assert "type" in errors[3]
+
+    assert reports[-1] == {"status": "done", "lines": 6, "imported": 2, "errors": 4, "batches": 1}
@@ -0,0 +1,70 @@
+import asyncio
+
+from app.database import count_queries
+from app.loaders import BatchLoader, project_detail_loader
+
+
+def test_missing_key_resolves_to_none_without_failing_the_batch():
+    batches = []
+
+    async def batch_fn(keys):
+        batches.append(sorted(keys))
+        return {key: key * 10 for key in keys if key != 3}
+
+    async def scenario():
+        loader = BatchLoader(batch_fn, window=0.01)
+        return await asyncio.gather(*(loader.load(key) for key in (1, 2, 3, 2)))
+
+    assert asyncio.run(scenario()) == [10, 20, None, 20]
+    assert batches == [[1, 2, 3]]
+
+
+def test_failed_batch_fails_every_waiter_and_the_next_batch_recovers():
+    calls = 0
+
+    async def batch_fn(keys):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError("database is locked")
+        return {key: key for key in keys}
+
+    async def scenario():
+        loader = BatchLoader(batch_fn, window=0.01)
+        failed = await asyncio.gather(loader.load(1), loader.load(2), return_exceptions=True)
+        return failed, await loader.load(1)
+
+    failed, recovered = asyncio.run(scenario())
+    assert all(isinstance(error, RuntimeError) for error in failed)
+    assert recovered == 1
+
+
+def test_cancelled_waiter_does_not_cancel_the_batch():
+    async def batch_fn(keys):
+        await asyncio.sleep(0.02)
+        return {key: key for key in keys}
+
+    async def scenario():
+        loader = BatchLoader(batch_fn, window=0.01)
+        cancelled = asyncio.ensure_future(loader.load(1))
+        kept = asyncio.ensure_future(loader.load(1))
+        await asyncio.sleep(0.015)
+        cancelled.cancel()
+        return await kept
+
+    assert asyncio.run(scenario()) == 1
+
+
+def test_every_waiter_is_charged_with_the_shared_batch(client, seeded):
+    async def scenario():
+        async def load(project_id):
+            with count_queries() as counter:
+                project = await project_detail_loader.load(project_id)
+            return project.id, counter.count
+
+        return await asyncio.gather(load(seeded["project_id"]), load(seeded["other_project_id"]))
+
+    (first, first_count), (second, second_count) = client.portal.call(scenario)
+    assert (first, second) == (seeded["project_id"], seeded["other_project_id"])
+    # Одна пачка на двоих, и каждому она записана целиком
+    assert first_count == second_count > 0
@@ -0,0 +1,57 @@
+import pytest
+
+
+def _all_pages(client, url, limit, items=lambda body: body):
+    """Проходит все страницы по X-Next-Cursor и возвращает ID в порядке выдачи"""
+    ids, cursor = [], None
+    while True:
+        params = {"limit": limit}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(url, params=params)
+        assert response.status_code == 200, response.text
+        page = items(response.json())
+        assert len(page) <= limit
+        ids += [item["id"] for item in page]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return ids
+
+
+ROUTES = [
+    ("/projects/", lambda body: body),
+    ("/projects/owner/1", lambda body: body),
+    ("/applications/project/1", lambda body: body),
+    ("/applications/project/1/top", lambda body: body["applications"]),
+]
+
+
+@pytest.mark.parametrize(("url", "items"), ROUTES, ids=[url for url, _ in ROUTES])
+def test_cursor_pages_have_no_gaps_or_duplicates(client, seeded, url, items):
+    small = _all_pages(client, url, 2, items)
+    large = _all_pages(client, url, 5, items)
+    assert small and len(small) == len(set(small))
+    assert small == large
+
+
+@pytest.mark.parametrize(("url", "items"), ROUTES, ids=[url for url, _ in ROUTES])
+def test_default_page_is_bounded(client, seeded, url, items):
+    response = client.get(url)
+    assert response.status_code == 200
+    assert len(items(response.json())) <= 50
+
+
+@pytest.mark.parametrize("url", [url for url, _ in ROUTES])
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "WzFd"])  # мусор и курсор не той формы ([1])
+def test_invalid_cursor_is_400(client, seeded, url, cursor):
+    assert client.get(url, params={"cursor": cursor}).status_code == 400
+
+
+def test_created_at_is_formatted_the_same_on_write_and_read(client, seeded):
+    created = client.post(
+        f"/projects/?owner_id={seeded['owner_id']}",
+        json={"title": "Timestamp check", "description": "Same format on write and read", "skill_ids": [1]},
+    ).json()
+    read = client.get(f"/projects/{created['id']}").json()
+    assert created["created_at"] == read["created_at"]
+    assert created["updated_at"] == read["updated_at"]
@@ -0,0 +1,42 @@
+import json
+import logging
+
+from app import metrics, profiling
+
+
+def test_loader_slow_queries_are_logged_under_waiting_route(client, seeded, monkeypatch, caplog):
+    # Порог 0: медленным считается каждый запрос
+    monkeypatch.setattr(metrics, "SLOW_QUERY_MS", 0)
+    route = "GET /projects/{project_id}"
+    before = metrics.SLOW_QUERIES.value(route)
+
+    with caplog.at_level(logging.WARNING, logger=metrics.logger.name):
+        response = client.get(f"/projects/{seeded['project_id']}")
+    assert response.status_code == 200
+
+    # Проект грузит лоадер в чистом контексте, но запросы его пачки — на счету роута
+    assert metrics.SLOW_QUERIES.value(route) > before
+    loader_records = [record.getMessage() for record in caplog.records if "FROM projects" in record.getMessage()]
+    assert loader_records
+    assert all(f"in {route}:" in message for message in loader_records)
+
+
+def test_profile_includes_loader_queries(client, seeded, monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling, "PROFILING_ENABLED", True)
+    monkeypatch.setattr(profiling, "PROFILE_DIR", tmp_path)
+
+    def profile(method, url, **kwargs):
+        response = client.request(method, url, headers={"X-Profile": "1"}, **kwargs)
+        assert response.status_code < 400, response.text
+        profile_id = response.headers["X-Profile-Id"]
+        return json.loads((tmp_path / f"{profile_id}.json").read_text())
+
+    detail = profile("GET", f"/projects/{seeded['project_id']}")
+    assert detail["sql"]["count"] > 0
+    assert any("FROM projects" in query["statement"] for query in detail["sql"]["queries"])
+
+    # Заявка: проект и заявитель читаются лоадерами, INSERT — в самом запросе
+    application = profile("POST", "/applications/?applicant_id=12", json={"project_id": seeded["project_id"]})
+    statements = [query["statement"] for query in application["sql"]["queries"]]
+    assert any(statement.startswith("SELECT") and "FROM users" in statement for statement in statements)
+    assert any(statement.startswith("INSERT INTO applications") for statement in statements)
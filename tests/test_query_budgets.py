@@ -0,0 +1,106 @@
+import itertools
+
+import pytest
+from fastapi.routing import APIRoute
+
+from app.main import app
+from app.query_budget import route_budget
+from app.response_cache import feed_cache, owner_stats_cache
+from app.skill_catalog import skill_catalog
+
+_usernames = (f"newcomer{i}" for i in itertools.count())
+
+
+# (метод, шаблон роута, функция seeded -> (url, kwargs запроса))
+CASES = [
+    ("POST", "/auth/register", lambda s: (
+        "/auth/register",
+        {"json": {"username": next(_usernames), "email": "newcomer@example.com", "full_name": "New"}},
+    )),
+    ("GET", "/auth/profile/{user_id}", lambda s: ("/auth/profile/2", {})),
+    ("POST", "/auth/profile/{user_id}/skills", lambda s: (
+        "/auth/profile/9/skills", {"json": {"skill_ids": [1, 2], "favorite_skill_ids": [1]}},
+    )),
+    ("PUT", "/auth/profile/{user_id}/skills", lambda s: (
+        "/auth/profile/10/skills", {"json": {"skill_ids": [2, 3], "favorite_skill_ids": []}},
+    )),
+    # Дубли и неизвестные ID: промахи каталога перепроверяются в БД
+    ("POST", "/auth/profile/{user_id}/skills", lambda s: (
+        "/auth/profile/9/skills", {"json": {"skill_ids": [3, 3, 999], "favorite_skill_ids": [3]}},
+    )),
+    ("PUT", "/auth/profile/{user_id}/skills", lambda s: (
+        "/auth/profile/10/skills", {"json": {"skill_ids": [4, 4, 998], "favorite_skill_ids": []}},
+    )),
+    ("GET", "/auth/skills", lambda s: ("/auth/skills", {})),
+    ("POST", "/projects/", lambda s: (
+        f"/projects/?owner_id={s['owner_id']}",
+        {"json": {"title": "Data pipeline", "description": "ETL jobs for analytics", "skill_ids": [1, 3]}},
+    )),
+    # Дубль и неизвестный ID: промах каталога перепроверяется в БД
+    ("POST", "/projects/", lambda s: (
+        f"/projects/?owner_id={s['owner_id']}",
+        {"json": {"title": "Data warehouse", "description": "Star schema for reports", "skill_ids": [2, 2, 999]}},
+    )),
+    ("GET", "/projects/", lambda s: ("/projects/?limit=10", {})),
+    ("GET", "/projects/recommended/{user_id}", lambda s: ("/projects/recommended/2", {})),
+    ("GET", "/projects/search", lambda s: ("/projects/search?q=python&user_id=2", {})),
+    ("GET", "/projects/{project_id}", lambda s: (f"/projects/{s['project_id']}", {})),
+    ("GET", "/projects/{project_id}/candidates", lambda s: (f"/projects/{s['project_id']}/candidates", {})),
+    ("GET", "/projects/owner/{owner_id}", lambda s: (f"/projects/owner/{s['owner_id']}", {})),
+    ("GET", "/projects/owner/{owner_id}/stats", lambda s: (f"/projects/owner/{s['owner_id']}/stats", {})),
+    ("PATCH", "/projects/{project_id}/status", lambda s: (
+        f"/projects/{s['other_project_id']}/status", {"json": {"status": "in_progress"}},
+    )),
+    ("POST", "/applications/", lambda s: (
+        "/applications/?applicant_id=11", {"json": {"project_id": s["project_id"]}},
+    )),
+    ("GET", "/applications/{app_id}", lambda s: (f"/applications/{s['application_ids'][0]}", {})),
+    ("GET", "/applications/project/{project_id}", lambda s: (f"/applications/project/{s['project_id']}", {})),
+    ("GET", "/applications/project/{project_id}/top", lambda s: (
+        f"/applications/project/{s['project_id']}/top?limit=3&min_score=0.1", {},
+    )),
+    ("PATCH", "/applications/{app_id}/accept", lambda s: (f"/applications/{s['application_ids'][0]}/accept", {})),
+    ("PATCH", "/applications/{app_id}/reject", lambda s: (f"/applications/{s['application_ids'][1]}/reject", {})),
+    ("PATCH", "/applications/bulk-status", lambda s: (
+        "/applications/bulk-status",
+        {"json": {"status": "rejected", "application_ids": s["application_ids"][2:4] + [999]}},
+    )),
+    ("POST", "/matching/score-batch", lambda s: (
+        "/matching/score-batch", {"json": {"user_id": 2, "project_ids": [1, 2, 999]}},
+    )),
+]
+
+
+def _budgeted_routes() -> set[tuple[str, str]]:
+    return {
+        (method, route.path)
+        for route in app.routes
+        if isinstance(route, APIRoute) and route_budget(route) is not None
+        for method in route.methods
+    }
+
+
+def test_every_budgeted_route_is_covered():
+    assert _budgeted_routes() == {(method, path) for method, path, _ in CASES}
+
+
+@pytest.mark.parametrize(("method", "path", "build"), CASES, ids=[f"{m} {p}" for m, p, _ in CASES])
+def test_route_stays_within_query_budget(client, recorder, seeded, method, path, build):
+    # Худший случай: все кэши холодные
+    feed_cache.invalidate()
+    owner_stats_cache.invalidate(seeded["owner_id"])
+    skill_catalog.invalidate()
+
+    url, kwargs = build(seeded)
+    response = client.request(method, url, **kwargs)
+    assert response.status_code < 400, response.text
+
+    assert recorder.route is not None and recorder.route.path == path
+    limit = route_budget(recorder.route)
+    assert recorder.count <= limit, f"{method} {path}: {recorder.count} queries > budget {limit}"
+
+
+def test_budget_overrun_is_detected(client, recorder, seeded):
+    """Счётчик действительно видит запросы роута: бюджет 0 был бы превышен"""
+    client.get(f"/projects/{seeded['project_id']}/candidates")
+    assert recorder.count > 0
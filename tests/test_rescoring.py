@@ -0,0 +1,61 @@
+import asyncio
+import logging
+import time
+
+from app import rescoring
+from app.rescoring import RescoreQueue
+
+
+def test_failures_back_off_and_log_once(caplog):
+    attempts = []
+
+    async def scenario():
+        queue = RescoreQueue(delay=0.01, max_backoff=0.08)
+
+        async def failing_rescore(user_ids):
+            attempts.append(time.perf_counter())
+            if len(attempts) <= 5:
+                raise RuntimeError("database is locked")
+            return len(user_ids)
+
+        queue.rescore = failing_rescore
+        await queue.start()
+        queue.mark_user(1)
+        await asyncio.sleep(1.0)
+        await queue.stop()
+        return queue
+
+    with caplog.at_level(logging.DEBUG, logger=rescoring.logger.name):
+        queue = asyncio.run(scenario())
+
+    # 5 сбоев и успех; без backoff за секунду было бы ~100 попыток
+    assert len(attempts) == 6
+    gaps = [later - earlier for earlier, later in zip(attempts, attempts[1:])]
+    assert gaps[-1] > gaps[0]
+    assert not queue._dirty_users
+
+    tracebacks = [record for record in caplog.records if record.exc_info]
+    assert len(tracebacks) == 1
+    assert any("recovered after 5 failed attempts" in record.getMessage() for record in caplog.records)
+
+
+def test_skill_change_rescores_pending_applications(client, seeded):
+    user_id = client.post(
+        "/auth/register", json={"username": "rescored", "email": "rescored@example.com", "full_name": "Rescored"},
+    ).json()["id"]
+    project_id = client.post(
+        f"/projects/?owner_id={seeded['owner_id']}",
+        json={"title": "Rescoring target", "description": "Needs skills 1 and 2", "skill_ids": [1, 2]},
+    ).json()["id"]
+    application = client.post(f"/applications/?applicant_id={user_id}", json={"project_id": project_id}).json()
+    assert application["compatibility_score"] == 0
+
+    assert client.put(f"/auth/profile/{user_id}/skills", json={"skill_ids": [1, 2]}).status_code == 200
+
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        score = client.get(f"/applications/{application['id']}").json()["compatibility_score"]
+        if score > 0:
+            break
+        time.sleep(0.05)
+    assert score == 1.0
@@ -0,0 +1,68 @@
+from sqlalchemy import create_engine, inspect, text
+
+from app.database import Base, _upgrade_schema
+
+# Что добавилось к схеме после первой версии приложения
+NEW_INDEXES = (
+    "ix_projects_status_created_at_id",
+    "ix_projects_owner_created_at_id",
+    "ix_applications_project_status_score_id",
+    "uq_applications_pending_project_applicant",
+)
+NEW_COLUMNS = (("users", "skill_count"), ("projects", "skill_count"))
+
+
+def _baseline_engine(path):
+    """БД в схеме первой версии: без денормализованных колонок и новых индексов"""
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        for index in NEW_INDEXES:
+            conn.execute(text(f"DROP INDEX {index}"))
+        for table, column in NEW_COLUMNS:
+            conn.execute(text(f"ALTER TABLE {table} DROP COLUMN {column}"))
+    return engine
+
+
+def _seed(conn):
+    conn.execute(text("INSERT INTO skills (id, name, category) VALUES (1, 'python', 'backend'), (2, 'sql', 'data')"))
+    conn.execute(text(
+        "INSERT INTO users (id, username, email, full_name, timezone) "
+        "VALUES (1, 'owner', 'owner@example.com', 'Owner', 'UTC'), (2, 'dev', 'dev@example.com', 'Dev', 'UTC')"
+    ))
+    conn.execute(text("INSERT INTO user_skill (user_id, skill_id, is_favorite) VALUES (2, 1, 0), (2, 2, 1)"))
+    conn.execute(text(
+        "INSERT INTO projects (id, title, description, owner_id, status) VALUES (1, 'API', 'REST API', 1, 'open')"
+    ))
+    conn.execute(text("INSERT INTO project_skill (project_id, skill_id) VALUES (1, 1)"))
+    # Двойная pending-заявка (её уникальный индекс уже не пропустит) и отклонённая
+    conn.execute(text(
+        "INSERT INTO applications (id, project_id, applicant_id, status, compatibility_score) "
+        "VALUES (1, 1, 2, 'rejected', 0.5), (2, 1, 2, 'pending', 0.5), (3, 1, 2, 'pending', 0.5)"
+    ))
+
+
+def test_upgrade_adds_columns_backfills_and_indexes(tmp_path):
+    engine = _baseline_engine(tmp_path / "old.db")
+    with engine.begin() as conn:
+        _seed(conn)
+
+    with engine.begin() as conn:
+        _upgrade_schema(conn)
+
+    inspector = inspect(engine)
+    for table, column in NEW_COLUMNS:
+        assert column in {c["name"] for c in inspector.get_columns(table)}
+    indexes = {index["name"] for table in ("projects", "applications") for index in inspector.get_indexes(table)}
+    assert set(NEW_INDEXES) <= indexes
+
+    with engine.connect() as conn:
+        assert dict(conn.execute(text("SELECT id, skill_count FROM users")).all()) == {1: 0, 2: 2}
+        assert conn.execute(text("SELECT skill_count FROM projects WHERE id = 1")).scalar() == 1
+        # Из дублей осталась самая ранняя pending-заявка, отклонённая не тронута
+        assert conn.execute(text("SELECT id FROM applications ORDER BY id")).scalars().all() == [1, 2]
+
+    # Повторный прогон (каждый старт приложения) ничего не ломает
+    with engine.begin() as conn:
+        _upgrade_schema(conn)
+    engine.dispose()
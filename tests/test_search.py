@@ -0,0 +1,52 @@
+import sqlite3
+
+import pytest
+
+from app.database import DATABASE_URL, init_db
+
+
+def _found(client, word):
+    response = client.get("/projects/search", params={"q": word})
+    assert response.status_code == 200
+    return {item["project"]["id"] for item in response.json()}
+
+
+@pytest.fixture
+def db():
+    # Пишем мимо приложения — как миграции или ручные правки, только триггеры FTS
+    conn = sqlite3.connect(DATABASE_URL.split(":///", 1)[1], timeout=5, isolation_level=None)
+    conn.execute("PRAGMA foreign_keys = ON")
+    yield conn
+    conn.close()
+
+
+def test_index_follows_insert_update_and_delete(client, seeded, db):
+    project_id = client.post(
+        f"/projects/?owner_id={seeded['owner_id']}",
+        json={"title": "Quokka tracker", "description": "Counting marsupials", "skill_ids": [1]},
+    ).json()["id"]
+    assert project_id in _found(client, "quokka")
+
+    db.execute("UPDATE projects SET title = 'Wombat tracker' WHERE id = ?", (project_id,))
+    assert project_id not in _found(client, "quokka")
+    assert project_id in _found(client, "wombat")
+
+    db.execute("DELETE FROM projects WHERE id = ?", (project_id,))
+    assert project_id not in _found(client, "wombat")
+
+
+def test_init_db_rebuilds_index_that_fell_out_of_sync(client, seeded, db):
+    project_id = client.post(
+        f"/projects/?owner_id={seeded['owner_id']}",
+        json={"title": "Platypus registry", "description": "Monotremes only", "skill_ids": [1]},
+    ).json()["id"]
+    # Как после пересоздания таблиц: индекс пуст, триггеров нет
+    db.execute("INSERT INTO projects_fts(projects_fts) VALUES ('delete-all')")
+    db.execute("DROP TRIGGER projects_fts_ai")
+    assert project_id not in _found(client, "platypus")
+
+    client.portal.call(init_db)
+
+    assert project_id in _found(client, "platypus")
+    trigger = db.execute("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'projects_fts_ai'").fetchone()
+    assert trigger is not None
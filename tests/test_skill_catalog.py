@@ -0,0 +1,30 @@
+import sqlite3
+
+from app.database import DATABASE_URL, count_queries
+from app.skill_catalog import skill_catalog
+
+
+def _resolve(client, skill_ids):
+    """resolve_ids в loop приложения; возвращает (результат, кол-во запросов)"""
+    async def resolve():
+        with count_queries() as counter:
+            resolved = await skill_catalog.resolve_ids(skill_ids)
+        return resolved, counter.count
+    return client.portal.call(resolve)
+
+
+def test_fresh_snapshot_misses_are_not_rechecked(client, seeded):
+    skill_catalog.invalidate()
+    assert _resolve(client, [2, 2, 1, 999]) == ([2, 1], 1)  # только загрузка снимка
+
+
+def test_skill_created_by_another_worker_is_found(client, seeded):
+    _resolve(client, [1])  # снимок прогрет
+    with sqlite3.connect(DATABASE_URL.split(":///", 1)[1], timeout=5) as conn:
+        skill_id = conn.execute(
+            "INSERT INTO skills (name, category) VALUES ('other-worker-skill', 'backend')"
+        ).lastrowid
+    version = skill_catalog.version
+
+    assert _resolve(client, [1, skill_id]) == ([1, skill_id], 1)  # перепроверка промаха
+    assert skill_catalog.version > version  # снимок сброшен